@@ -1,20 +1,59 @@
 """Base for all models."""
 from abc import ABC
-from typing import Any, Callable, Deque, Dict, Iterator, Optional, Type, Union
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from .const import EMPTY_PAYLOAD, EVENT_PLACEHOLDER, LOGGER
-from .options import OZWOptions
+from .options import ListenerScope, OZWOptions
+
+# Collections of models without collections. Shared, do not modify.
+NO_COLLECTIONS: dict = {}
+
+NO_KEYS: FrozenSet[str] = frozenset()
+MISSING = object()
 
 
 class ItemCollection:
-    """Initialize an item collection."""
+    """Initialize an item collection.
+
+    With lazy_values on the options, items of classes with EVENT_LAZY_ADDED are
+    held as payload. The model is built when the item is accessed, or when there
+    are listeners for its events.
+    """
+
+    __slots__ = ("parent", "topic_part", "item_class", "collection", "lazy_payloads")
 
-    def __init__(self, item_class: Type["ZWaveBase"]):
+    def __init__(
+        self,
+        item_class: Type["ZWaveBase"],
+        parent: Optional["ZWaveBase"] = None,
+        topic_part: Optional[str] = None,
+    ):
         """Initialize item collection instance."""
-        self.parent: Optional["ZWaveBase"] = None
-        self.topic_part: Optional[str] = None
+        self.parent = parent
+        self.topic_part = topic_part
         self.item_class = item_class
         self.collection: Dict[int, "ZWaveBase"] = {}
+        # Payloads of items without a model by item id. None if not lazy.
+        self.lazy_payloads: Optional[Dict[int, dict]] = None
+
+        options = parent.options if parent is not None else None
+        if options and options.lazy_values and item_class.EVENT_LAZY_ADDED:
+            self.lazy_payloads = {}
 
         assert item_class.EVENT_ADDED != EVENT_PLACEHOLDER
         assert item_class.EVENT_REMOVED != EVENT_PLACEHOLDER
@@ -27,7 +66,19 @@ class ItemCollection:
 
     def get(self, item_id: int) -> Optional["ZWaveBase"]:
         """Return item in collection."""
-        return self.collection.get(item_id)
+        item = self.collection.get(item_id)
+
+        if item is None and self.lazy_payloads and item_id in self.lazy_payloads:
+            item = self.materialize(item_id)
+
+        return item
+
+    def values(self) -> Iterable["ZWaveBase"]:
+        """Return all items in collection."""
+        if self.lazy_payloads:
+            self.materialize_all()
+
+        return self.collection.values()
 
     def process_message(self, topic: Deque[str], message: dict) -> None:
         """Process a new message."""
@@ -35,31 +86,124 @@ class ItemCollection:
         item = self.collection.get(item_id)
         added = False
 
+        if item is None and self.lazy_payloads is not None:
+            if self._process_lazy(item_id, topic, message):
+                return
+            item = self.collection.get(item_id)
+
         if item is None and message is EMPTY_PAYLOAD:
             return
 
         if item is None:
-            topic_part = str(item_id)
-
-            if self.topic_part is not None:
-                topic_part = f"{self.topic_part}/{topic_part}"
-
-            assert self.parent is not None
-            item = self.collection[item_id] = self.item_class(
-                self.parent.options, self.parent, topic_part, item_id
-            )
+            item = self.create_item(item_id)
             added = True
 
         if len(topic) == 0 and message is EMPTY_PAYLOAD:
             self.remove_and_notify(item_id)
             return
 
+        old_data = item.data
         item.process_message(topic, message)
 
         # Only notify after we process the message.
         if added:
+            item.add_to_indexes()
             assert self.parent is not None
             self.parent.options.notify(self.item_class.EVENT_ADDED, item)
+        elif item.data is not old_data:
+            item.update_indexes(old_data)
+
+    def create_item(self, item_id: int) -> "ZWaveBase":
+        """Create an item in the collection, without indexing or notifying."""
+        topic_part = str(item_id)
+
+        if self.topic_part is not None:
+            topic_part = f"{self.topic_part}/{topic_part}"
+
+        assert self.parent is not None
+        item = self.collection[item_id] = self.item_class(
+            self.parent.options, self.parent, topic_part, item_id
+        )
+        return item
+
+    def _process_lazy(self, item_id: int, topic: Deque[str], message: dict) -> bool:
+        """Process a message for an item without a model, if it can stay that way.
+
+        Return if the message was processed. Otherwise the item is built, if it
+        was held, and the message should be processed by the model.
+        """
+        lazy_payloads = self.lazy_payloads
+        assert lazy_payloads is not None and self.parent is not None
+        item_class = self.item_class
+        options = self.parent.options
+        held = item_id in lazy_payloads
+        # Scoped listeners only build the items that they match.
+        lazy_item = LazyItem(self, item_id)
+
+        if topic:
+            if held:
+                self.materialize(item_id)
+            return False
+
+        if message is EMPTY_PAYLOAD:
+            if not held:
+                return False
+
+            if options.has_listeners_for(item_class.EVENT_REMOVED, lazy_item):
+                self.materialize(item_id)
+                return False
+
+            item_class.remove_lazy_from_indexes(self, item_id)
+            del lazy_payloads[item_id]
+            return True
+
+        if held:
+            delta_event = item_class.EVENT_DELTA
+            if options.has_listeners_for(item_class.EVENT_CHANGED, lazy_item) or (
+                delta_event is not None
+                and options.has_listeners_for(delta_event, lazy_item)
+            ):
+                self.materialize(item_id)
+                return False
+
+            old_payload = lazy_payloads[item_id]
+            lazy_payloads[item_id] = message
+            item_class.update_lazy_indexes(self, item_id, old_payload)
+            return True
+
+        if options.has_listeners_for(item_class.EVENT_ADDED, lazy_item):
+            return False
+
+        self.hold(item_id, message)
+
+        lazy_event = item_class.EVENT_LAZY_ADDED
+        assert lazy_event is not None
+        if options.has_listeners(lazy_event):
+            options.notify(lazy_event, lazy_item)
+        return True
+
+    def hold(self, item_id: int, payload: dict) -> None:
+        """Hold the payload of an item without building its model."""
+        assert self.lazy_payloads is not None
+        self.lazy_payloads[item_id] = payload
+        self.item_class.add_lazy_to_indexes(self, item_id)
+
+    def materialize(self, item_id: int) -> "ZWaveBase":
+        """Build the model of a held item. No added event is fired."""
+        assert self.lazy_payloads is not None
+        self.item_class.remove_lazy_from_indexes(self, item_id)
+        payload = self.lazy_payloads.pop(item_id)
+
+        item = self.create_item(item_id)
+        item.process_message(deque(), payload)
+        item.add_to_indexes()
+        return item
+
+    def materialize_all(self) -> None:
+        """Build the models of all held items."""
+        assert self.lazy_payloads is not None
+        for item_id in list(self.lazy_payloads):
+            self.materialize(item_id)
 
     def remove_and_notify(self, item_id: int) -> None:
         """Remove item from collection and fire remove events for all child objects."""
@@ -69,22 +213,163 @@ class ItemCollection:
             if not isinstance(collection, ItemCollection):
                 continue
 
+            if collection.lazy_payloads:
+                collection.remove_held()
+
             for item in list(collection):
                 assert item.id is not None
                 collection.remove_and_notify(item.id)
 
+        item = self.collection.pop(item_id)
+        item.remove_from_indexes()
+
         assert self.parent is not None
-        self.parent.options.notify(
-            self.item_class.EVENT_REMOVED, self.collection.pop(item_id)
-        )
+        self.parent.options.notify(self.item_class.EVENT_REMOVED, item)
+
+    def remove_held(self) -> None:
+        """Remove held items, building those with listeners for removed events."""
+        assert self.lazy_payloads is not None and self.parent is not None
+        options = self.parent.options
+        event = self.item_class.EVENT_REMOVED
+
+        for item_id in list(self.lazy_payloads):
+            if options.has_listeners_for(event, LazyItem(self, item_id)):
+                self.materialize(item_id)
+                continue
+
+            self.item_class.remove_lazy_from_indexes(self, item_id)
+            del self.lazy_payloads[item_id]
 
     def __iter__(self) -> Iterator:
         """Return iterator over all items in this collection."""
-        return iter(self.collection.values())
+        return iter(self.values())
+
+
+class LazyItem(NamedTuple):
+    """Item of a collection that is held as payload, sent with lazy added events.
+
+    The model is built when item is accessed.
+    """
+
+    collection: ItemCollection
+    id: int
+
+    @property
+    def data(self) -> Optional[dict]:
+        """Return the payload of the item."""
+        lazy_payloads = self.collection.lazy_payloads
+        if lazy_payloads and self.id in lazy_payloads:
+            return lazy_payloads[self.id]
+
+        item = self.collection.collection.get(self.id)
+        return EMPTY_PAYLOAD if item is None else item.data
+
+    @property
+    def item(self) -> Optional["ZWaveBase"]:
+        """Return the model of the item, building it if needed."""
+        return self.collection.get(self.id)
+
+    @property
+    def listener_scope(self) -> ListenerScope:
+        """Return the listener scope the model of the item would have."""
+        assert self.collection.parent is not None
+        scope = self.collection.parent.listener_scope
+        scope_field = self.collection.item_class.SCOPE_FIELD
+
+        if scope_field is None:
+            return scope
+
+        return scope._replace(**{scope_field: self.id})
+
+
+class cached_data_property:  # pylint: disable=invalid-name
+    """Property derived from data that is cached until the data changes."""
+
+    def __init__(self, func: Callable[["ZWaveBase"], Any]):
+        """Initialize the property."""
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(
+        self, obj: Optional["ZWaveBase"], objtype: Optional[type] = None
+    ) -> Any:
+        """Return the cached value or compute it."""
+        if obj is None:
+            return self
+
+        cache = obj.data_cache
+
+        if cache is None:
+            cache = obj.data_cache = {}
+        elif self.name in cache:
+            return cache[self.name]
+
+        value = cache[self.name] = self.func(obj)
+        return value
+
+
+class CollectionAccessor:
+    """Class level accessor of a collection, like get_node and nodes of OZWInstance.
+
+    Returns the get method of an item collection, the values method of an item
+    collection if plural, or a function returning a single child.
+    """
+
+    def __init__(self, collection_name: str, plural: bool):
+        """Initialize the accessor."""
+        self.collection_name = collection_name
+        self.plural = plural
+
+    def __get__(
+        self, obj: Optional["ZWaveBase"], objtype: Optional[type] = None
+    ) -> Any:
+        """Return the accessor function for a model."""
+        if obj is None:
+            return self
+
+        collection = obj.collections[self.collection_name]
+
+        if isinstance(collection, ItemCollection):
+            return collection.values if self.plural else collection.get
+
+        return create_getter(collection)
+
+
+class DataDelta(NamedTuple):
+    """Changed keys of the data of a model, with their previous and new value.
+
+    Keys that were added or removed have None as previous or new value.
+    """
+
+    model: "ZWaveBase"
+    changes: Dict[str, Tuple[Any, Any]]
+
+    @property
+    def listener_scope(self) -> ListenerScope:
+        """Return the listener scope of the model."""
+        return self.model.listener_scope
 
 
 class ZWaveBase(ABC):
-    """A base class for all models."""
+    """A base class for all models.
+
+    Models use __slots__ and subclasses should declare theirs too, to keep the
+    memory footprint of the model tree small.
+    """
+
+    __slots__ = (
+        "options",
+        "parent",
+        "topic_part",
+        "topic",
+        "id",
+        "collections",
+        "data",
+        "data_cache",
+        "changed_keys",
+        "pending_messages",
+    )
 
     # Name the direct collection that lives underneath this object
     # but is not named in the topic. A message to /openzwave/1 will
@@ -98,10 +383,20 @@ class ZWaveBase(ABC):
     # Use in case there is a special plural name of this class.
     PLURAL_NAME: Optional[str] = None
 
+    # Field of the ListenerScope that is filled with the id of this object.
+    SCOPE_FIELD: Optional[str] = None
+
     EVENT_ADDED = EVENT_PLACEHOLDER
     EVENT_CHANGED = EVENT_PLACEHOLDER
     EVENT_REMOVED = EVENT_PLACEHOLDER
 
+    # Event with a DataDelta, fired after the changed event if it has listeners.
+    EVENT_DELTA: Optional[str] = None
+
+    # Event with a LazyItem, fired instead of the added event for items that are
+    # held as payload. Items of classes without it are never held.
+    EVENT_LAZY_ADDED: Optional[str] = None
+
     def __init__(
         self,
         options: OZWOptions,
@@ -119,62 +414,84 @@ class ZWaveBase(ABC):
         # Part of the topic that instantiated this object.
         self.topic_part = topic_part
 
+        # Topic of this object, without trailing slash. Topic parts never change.
+        if parent is not None:
+            self.topic: str = f"{parent.topic}/{topic_part}"
+        else:
+            # Cut off the trailing slash. Models without options have no prefix.
+            self.topic = options.topic_prefix[:-1] if options else ""
+
         # Identifier of this object
         self.id = item_id
 
+        # State of subclasses, like indexes of descendants
+        self._init_state()
+
         # Models that live under this model
+        cls = type(self)
+        schema = cls.__dict__.get("_collection_schema")
+
+        if schema is None or schema.source is not cls.create_collections:
+            schema = CollectionSchema(self)
+            setattr(cls, "_collection_schema", schema)
+
         self.collections: Dict[
             str, Union[ItemCollection, "ZWaveBase", "DiscardMessages", "EventMessages"]
-        ] = {}
+        ] = schema.create(self)
 
         # The data this object holds
         self.data = self.DEFAULT_VALUE
 
+        # Values of cached_data_property, cleared when data changes
+        self.data_cache: Optional[Dict[str, Any]] = None
+
+        # Keys of data that changed since the changed event was last delivered.
+        # Only computed if there are listeners for the changed event.
+        self.changed_keys = NO_KEYS
+
         # Messages for children that are held until data is received
         self.pending_messages: Optional[list] = None
 
         assert self.EVENT_CHANGED != EVENT_PLACEHOLDER
 
-        # Process collections
-        for item_type, collection in self.create_collections().items():
-            if isinstance(collection, type):  # OZWBase
-                self.collections[item_type] = collection(
-                    self.options, self, item_type, None
-                )
-                setattr(
-                    self, f"get_{item_type}", create_getter(self.collections[item_type])
-                )
-                continue
+    def reset_changed_keys(self) -> None:
+        """Forget the changed keys once the changed event has been delivered."""
+        self.changed_keys = NO_KEYS
 
-            if not isinstance(collection, ItemCollection):
-                self.collections[item_type] = collection
-                continue
+    def _init_state(self) -> None:
+        """Initialize the state that a subclass declares in __slots__.
 
-            setattr(self, f"get_{item_type}", collection.get)
+        Called by __init__ before the collections are created.
+        """
 
-            plural_name = collection.item_class.PLURAL_NAME or f"{item_type}s"
-            if hasattr(self, plural_name):
-                raise RuntimeError(
-                    f"Cannot add {plural_name} function to {type(self).__name__}. Already exists."
-                )
-            setattr(self, plural_name, collection.collection.values)
+    @classmethod
+    def install_accessor(cls, name: str, collection_name: str, plural: bool) -> None:
+        """Install an accessor of a collection on this class if not installed yet."""
+        current = getattr(cls, name, None)
 
-            if item_type == self.DIRECT_COLLECTION:
-                coll_topic_part: Optional[str] = None
-            else:
-                coll_topic_part = item_type
+        if isinstance(current, CollectionAccessor):
+            if (current.collection_name, current.plural) == (collection_name, plural):
+                return
 
-            collection.adopt(self, coll_topic_part)
-            self.collections[item_type] = collection
+        elif current is not None:
+            raise RuntimeError(
+                f"Cannot add {name} function to {cls.__name__}. Already exists."
+            )
+
+        setattr(cls, name, CollectionAccessor(collection_name, plural))
 
     @property
-    def topic(self) -> str:
-        """Return topic of this object."""
-        if self.parent is None:
-            # Cut off the trailing slash
-            return self.options.topic_prefix[:-1]
+    def listener_scope(self) -> ListenerScope:
+        """Return the ids that scoped listeners are matched against."""
+        fields = {}
+        model: Optional[ZWaveBase] = self
+
+        while model is not None:
+            if model.SCOPE_FIELD is not None:
+                fields[model.SCOPE_FIELD] = model.id
+            model = model.parent
 
-        return f"{self.parent.topic}/{self.topic_part}"
+        return ListenerScope(**fields)
 
     def create_collections(
         self,
@@ -192,11 +509,44 @@ class ZWaveBase(ABC):
     def process_message(self, topic: Deque[str], message: dict) -> None:
         """Process a new message."""
         if len(topic) == 0:
-            is_init_msg = self.data is EMPTY_PAYLOAD
+            old_data = self.data
+            is_init_msg = old_data is EMPTY_PAYLOAD
             self.data = message
+            self.data_cache = None
 
             if not is_init_msg:
-                self.options.notify(self.EVENT_CHANGED, self)
+                options = self.options
+                volatile_keys = options.volatile_keys
+
+                if options.suppress_unchanged and not has_changes(
+                    old_data, message, volatile_keys
+                ):
+                    return
+
+                # Only diffed per key if someone can read the result.
+                delta_event = self.EVENT_DELTA
+                notify_delta = delta_event is not None and options.has_listeners(
+                    delta_event
+                )
+                keys = NO_KEYS
+                if notify_delta or options.has_listeners(self.EVENT_CHANGED):
+                    keys = changed_keys(old_data, message, volatile_keys)
+                    # Merged until a batched or dispatched event is delivered.
+                    if self.changed_keys:
+                        self.changed_keys = self.changed_keys | keys
+                    else:
+                        self.changed_keys = keys
+
+                if not options.notify(self.EVENT_CHANGED, self):
+                    self.changed_keys = NO_KEYS
+
+                if notify_delta:
+                    assert delta_event is not None
+                    previous = old_data or EMPTY_PAYLOAD
+                    changes = {
+                        key: (previous.get(key), message.get(key)) for key in keys
+                    }
+                    options.notify(delta_event, DataDelta(self, changes))
                 return
 
             # Process all messages for the children.
@@ -226,6 +576,32 @@ class ZWaveBase(ABC):
 
         self.collections[collection_type].process_message(topic, message)
 
+    def add_to_indexes(self) -> None:
+        """Add this object to indexes after it was added to a collection."""
+
+    def update_indexes(self, old_data: Optional[dict]) -> None:
+        """Update indexes after this object in a collection received new data."""
+
+    def remove_from_indexes(self) -> None:
+        """Remove this object from indexes after it was removed from a collection."""
+
+    @classmethod
+    def add_lazy_to_indexes(cls, collection: ItemCollection, item_id: int) -> None:
+        """Add an item that is held as payload to indexes."""
+
+    @classmethod
+    def update_lazy_indexes(
+        cls, collection: ItemCollection, item_id: int, old_payload: dict
+    ) -> None:
+        """Update indexes after the payload of a held item changed."""
+
+    @classmethod
+    def remove_lazy_from_indexes(cls, collection: ItemCollection, item_id: int) -> None:
+        """Remove an item that is held as payload from indexes.
+
+        Called while the payload is still held.
+        """
+
     def _warn_cannot_handle(self, topic: Deque[str], message: dict) -> None:
         LOGGER.warning(
             "%s cannot process message %s: %s",
@@ -247,24 +623,165 @@ class DiscardMessages:
         """Process incoming message."""
 
 
+class CollectionSchema:
+    """Collections of a model class, compiled once from create_collections.
+
+    create_collections is called for the first instance of a class. The accessors
+    are installed on the class and the collections of the other instances are
+    created from the schema. The schema is compiled again if create_collections
+    is replaced.
+    """
+
+    __slots__ = ("source", "entries")
+
+    def __init__(self, model: "ZWaveBase"):
+        """Compile the schema from the collections of a model."""
+        model_class = type(model)
+        self.source = model_class.create_collections
+        self.entries: List[Tuple[str, Any, Optional[str]]] = []
+
+        for item_type, collection in model.create_collections().items():
+            if isinstance(collection, type):  # OZWBase
+                model_class.install_accessor(f"get_{item_type}", item_type, False)
+                self.entries.append((item_type, collection, None))
+                continue
+
+            if not isinstance(collection, ItemCollection):
+                self.entries.append((item_type, collection, None))
+                continue
+
+            model_class.install_accessor(f"get_{item_type}", item_type, False)
+
+            plural_name = collection.item_class.PLURAL_NAME or f"{item_type}s"
+            model_class.install_accessor(plural_name, item_type, True)
+
+            if item_type == model.DIRECT_COLLECTION:
+                coll_topic_part: Optional[str] = None
+            else:
+                coll_topic_part = item_type
+
+            self.entries.append((item_type, collection, coll_topic_part))
+
+    def create(
+        self, model: "ZWaveBase"
+    ) -> Dict[
+        str, Union[ItemCollection, "ZWaveBase", "DiscardMessages", "EventMessages"]
+    ]:
+        """Create the collections of a model."""
+        # Leaf models share the empty dict.
+        if not self.entries:
+            return NO_COLLECTIONS
+
+        collections: Dict[
+            str, Union[ItemCollection, ZWaveBase, DiscardMessages, EventMessages]
+        ] = {}
+
+        for item_type, prototype, coll_topic_part in self.entries:
+            if isinstance(prototype, ItemCollection):
+                collections[item_type] = ItemCollection(
+                    prototype.item_class, model, coll_topic_part
+                )
+            elif isinstance(prototype, type):
+                collections[item_type] = prototype(
+                    model.options, model, item_type, None
+                )
+            elif isinstance(prototype, EventMessages):
+                collections[item_type] = EventMessages(
+                    model.options, prototype.event, prototype.type_extractor, model
+                )
+            else:
+                # DiscardMessages has no state.
+                collections[item_type] = prototype
+
+        return collections
+
+
+class EventPayload(dict):
+    """Payload of an event from EventMessages, with the scope of its parent."""
+
+    __slots__ = ("listener_scope",)
+
+    def __init__(self, listener_scope: ListenerScope, **kwargs: Any):
+        """Initialize the payload."""
+        super().__init__(**kwargs)
+        self.listener_scope = listener_scope
+
+
 class EventMessages:
-    """Class that converts messages to events."""
+    """Class that converts messages to events.
+
+    Listeners scoped to the parent, or one of its ancestors, receive the events.
+    """
 
     def __init__(
         self,
         options: OZWOptions,
         event: str,
         type_extractor: Callable[[Deque[str], dict], str],
+        parent: Optional["ZWaveBase"] = None,
     ):
         """Initialize EventMessages."""
         self.options = options
         self.event = event
         self.type_extractor = type_extractor
+        self.parent = parent
 
     def process_message(self, topic: Deque[str], message: dict) -> None:
         """Process incoming message."""
         event_type = self.type_extractor(topic, message)
-        self.options.notify(self.event, {"event": event_type, "data": message})
+        scope = ListenerScope() if self.parent is None else self.parent.listener_scope
+        self.options.notify(
+            self.event, EventPayload(scope, event=event_type, data=message)
+        )
+
+
+def reindex(
+    index: Dict[Any, ZWaveBase], item: ZWaveBase, old_key: Any, new_key: Any
+) -> None:
+    """Move an item in an index from the old key to the new key.
+
+    A key of None means that the item is not in the index.
+    """
+    if old_key is not None and index.get(old_key) is item:
+        del index[old_key]
+
+    if new_key is not None:
+        index[new_key] = item
+
+
+def has_changes(
+    old_data: Optional[dict], new_data: dict, ignored_keys: FrozenSet[str]
+) -> bool:
+    """Return if the data changed, except for ignored keys."""
+    if old_data == new_data:
+        return False
+
+    if not ignored_keys or not old_data:
+        return True
+
+    # Compare with the ignored keys of the old data, so the comparison stays in C.
+    patched = dict(new_data)
+    for key in ignored_keys:
+        if key in old_data:
+            patched[key] = old_data[key]
+        else:
+            patched.pop(key, None)
+
+    return patched != old_data
+
+
+def changed_keys(
+    old_data: Optional[dict], new_data: dict, ignored_keys: FrozenSet[str]
+) -> FrozenSet[str]:
+    """Return the keys that are added, removed or changed, except ignored keys."""
+    if not old_data:
+        return frozenset(new_data.keys() - ignored_keys)
+
+    get = old_data.get
+    keys = {key for key, value in new_data.items() if get(key, MISSING) != value}
+    keys.update(old_data.keys() - new_data.keys())
+    keys -= ignored_keys
+    return frozenset(keys) if keys else NO_KEYS
 
 
 def create_getter(obj: Any) -> Callable:
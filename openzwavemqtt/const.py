@@ -42,11 +42,27 @@ EVENT_NODE_ASSOCIATION_REMOVED = "node_association_removed"
 EVENT_NODE_STATISTICS_CHANGED = "node_statistics_changed"
 EVENT_VALUE_ADDED = "value_added"
 EVENT_VALUE_CHANGED = "value_changed"
+EVENT_VALUE_DELTA = "value_delta"
 EVENT_VALUE_REMOVED = "value_removed"
+EVENT_LAZY_VALUE_ADDED = "lazy_value_added"
 
 # Default/empty payload on MQTT messages
 EMPTY_PAYLOAD: dict = {}
 
+# Overflow policies of the async event dispatcher
+OVERFLOW_BLOCK = "block"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_COALESCE, OVERFLOW_DROP_OLDEST)
+
+# Handling of heavy payload fields
+HEAVY_FIELD_STRIP = "strip"
+HEAVY_FIELD_LAZY = "lazy"
+HEAVY_FIELD_MODES = (HEAVY_FIELD_STRIP, HEAVY_FIELD_LAZY)
+
+# Base64 encoded product picture in the MetaData of nodes
+FIELD_PRODUCT_PIC = ("MetaData", "ProductPicBase64")
+
 
 class OpenZWaveStatus(Enum):
     """Enum with all Status strings for the OZW Daemon."""
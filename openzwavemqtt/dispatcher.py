@@ -0,0 +1,130 @@
+"""Dispatch events to listeners from an asyncio task."""
+import asyncio
+import inspect
+from collections import deque
+from typing import TYPE_CHECKING, Deque, List, Optional, Set, Tuple
+
+from .const import (
+    LOGGER,
+    OVERFLOW_BLOCK,
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_POLICIES,
+)
+
+if TYPE_CHECKING:
+    from .options import EventData, Listener  # noqa: F401
+
+
+class AsyncDispatcher:
+    """Call listeners from a bounded queue, outside of message processing.
+
+    Pass the dispatcher to OZWOptions and run it with ``await dispatcher.run()``.
+    Listeners may be coroutine functions.
+
+    Overflow policies for when the queue holds maxsize events:
+
+    - block: ingestion waits until there is room, see wait_for_room.
+    - drop_oldest: the oldest queued event is dropped.
+    - coalesce: like block, but an event is dropped if the same event for the same
+      object is still queued. Objects are live, so listeners see the latest state.
+    """
+
+    def __init__(self, maxsize: int = 1000, overflow: str = OVERFLOW_BLOCK):
+        """Initialize the dispatcher."""
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow}")
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.queue: Deque[
+            Tuple[Tuple[str, int], List["Listener"], "EventData"]
+        ] = deque()
+        # Keys of queued events when coalescing.
+        self.queued_keys: Set[Tuple[str, int]] = set()
+
+        # Metrics
+        self.max_queue_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+        # Created inside the running loop.
+        self._has_events: Optional[asyncio.Event] = None
+        self._has_room: Optional[asyncio.Event] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of queued events."""
+        return len(self.queue)
+
+    @property
+    def is_full(self) -> bool:
+        """Return if the queue holds maxsize events or more."""
+        return len(self.queue) >= self.maxsize
+
+    def put(self, event: str, data: "EventData", listeners: List["Listener"]) -> None:
+        """Queue an event for its listeners."""
+        key = (event, id(data))
+
+        if self.overflow == OVERFLOW_COALESCE:
+            if key in self.queued_keys:
+                self.coalesced += 1
+                return
+            self.queued_keys.add(key)
+
+        elif self.overflow == OVERFLOW_DROP_OLDEST and self.is_full:
+            self.queue.popleft()
+            self.dropped += 1
+
+        # Messages are processed synchronously, so the queue can go over maxsize
+        # for blocking policies until ingestion waits for room.
+        self.queue.append((key, listeners, data))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+
+        if self._has_events is not None:
+            self._has_events.set()
+
+    async def wait_for_room(self) -> None:
+        """Wait until the queue has room for more events.
+
+        Call this between messages to apply backpressure on ingestion.
+        """
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            return
+
+        while self.is_full:
+            if self._has_room is None:
+                self._has_room = asyncio.Event()
+            self._has_room.clear()
+            await self._has_room.wait()
+
+    async def run(self) -> None:
+        """Call listeners of queued events until cancelled."""
+        if self._has_events is None:
+            self._has_events = asyncio.Event()
+
+        while True:
+            if not self.queue:
+                self._has_events.clear()
+                await self._has_events.wait()
+                continue
+
+            key, listeners, data = self.queue.popleft()
+            self.queued_keys.discard(key)
+
+            if self._has_room is not None and not self.is_full:
+                self._has_room.set()
+
+            for listener in listeners:
+                try:
+                    result = listener(data)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception("Error in listener %s for %s", listener, key[0])
+
+            if key[0].endswith("_changed"):
+                data.reset_changed_keys()  # type: ignore
+
+            # Let message processing run between events.
+            await asyncio.sleep(0)
@@ -19,3 +19,7 @@ class WrongTypeError(NotSupportedError):
 
 class InvalidValueError(NotSupportedError):
     """Exception that is raised when an input value is invalid."""
+
+
+class PublishQueueFullError(BaseOZWError):
+    """Exception that is raised when a message can't be queued for publishing."""
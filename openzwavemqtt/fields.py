@@ -0,0 +1,157 @@
+"""Reduce the memory held by heavy fields of payloads."""
+import binascii
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .const import HEAVY_FIELD_STRIP
+
+
+class LazyField:
+    """Base64 encoded field of a payload, held as raw bytes until accessed."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: bytes):
+        """Initialize the field."""
+        self.raw = raw
+
+    @property
+    def value(self) -> str:
+        """Return the base64 encoded value of the field."""
+        return binascii.b2a_base64(self.raw, newline=False).decode()
+
+    def __eq__(self, other: Any) -> bool:
+        """Return if the other object is a field with the same raw bytes."""
+        return isinstance(other, LazyField) and other.raw == self.raw
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        """Return a representation of this field."""
+        return f"<LazyField {len(self.raw)} bytes>"
+
+
+def reduced_field(value: Union[str, bytes], mode: str) -> Union[str, LazyField]:
+    """Return a stripped or lazy field for a non-empty base64 value.
+
+    Values that can not be decoded are kept as str. Characters that are not
+    base64 are skipped while decoding.
+    """
+    if mode == HEAVY_FIELD_STRIP:
+        return ""
+
+    try:
+        return LazyField(binascii.a2b_base64(value))
+    except binascii.Error:
+        return value if isinstance(value, str) else value.decode()
+
+
+def decode_without_heavy_fields(
+    decoder: Callable[[Union[str, bytes]], Any],
+    message: Union[str, bytes],
+    paths: Sequence[Tuple[str, ...]],
+    mode: str,
+) -> dict:
+    """Decode a message with the fields at the given paths reduced.
+
+    String values are cut out of the message before it is decoded, so the
+    decoder does not build them. This is done for fields whose key occurs once
+    in the message and whose value has no escapes. Other fields are left for
+    reduce_heavy_fields.
+    """
+    cut_message = message
+    cut: Dict[Tuple[str, ...], Union[str, bytes]] = {}
+
+    for path in paths:
+        value_range = find_string_value(cut_message, path[-1])
+
+        if value_range is not None:
+            start, end = value_range
+            cut[path] = cut_message[start:end]
+            cut_message = cut_message[:start] + cut_message[end:]  # type: ignore
+
+    payload: dict = decoder(cut_message)
+
+    for path, value in cut.items():
+        container = get_container(payload, path)
+
+        if container is None or container.get(path[-1]) != "":
+            # The key is not at the path, decode the message as it is.
+            payload = decoder(message)
+            break
+
+        if value:
+            container[path[-1]] = reduced_field(value, mode)
+
+    return payload
+
+
+def find_string_value(
+    message: Union[str, bytes], key: str
+) -> Optional[Tuple[int, int]]:
+    """Return the range of the string value of a key that occurs once.
+
+    Return None if the key occurs more than once, its value is not a string or
+    the value has escapes.
+    """
+    if isinstance(message, str):
+        marker: Any = f'"{key}"'
+        quote: Any = '"'
+        backslash: Any = "\\"
+    else:
+        marker = f'"{key}"'.encode()
+        quote = b'"'
+        backslash = b"\\"
+
+    key_start = message.find(marker)
+
+    if key_start == -1 or message.find(marker, key_start + 1) != -1:
+        return None
+
+    key_end = key_start + len(marker)
+    start = message.find(quote, key_end) + 1
+
+    if not start or message[key_end : start - 1].strip() not in (":", b":"):
+        return None
+
+    end = message.find(quote, start)
+
+    if end == -1 or message.find(backslash, start, end) != -1:
+        return None
+
+    return start, end
+
+
+def get_container(payload: dict, path: Tuple[str, ...]) -> Optional[dict]:
+    """Return the dict that holds the field at a path, if there is one."""
+    container = payload
+
+    for key in path[:-1]:
+        child = container.get(key)
+
+        if not isinstance(child, dict):
+            return None
+
+        container = child
+
+    return container
+
+
+def reduce_heavy_fields(
+    payload: dict, paths: Sequence[Tuple[str, ...]], mode: str
+) -> None:
+    """Strip or lazily hold the fields of a payload at the given paths.
+
+    Stripped fields are set to an empty string, like the daemon does for
+    nodes without a product picture. Fields that were already reduced are
+    skipped.
+    """
+    for path in paths:
+        container = get_container(payload, path)
+
+        if container is None:
+            continue
+
+        value = container.get(path[-1])
+
+        if isinstance(value, str) and value:
+            container[path[-1]] = reduced_field(value, mode)
@@ -1,20 +1,24 @@
 """Root Manager object."""
-import json
+import time
 from collections import deque
-from typing import TYPE_CHECKING, Dict, Optional, Type, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Type, Union
 
-from .base import ItemCollection, ZWaveBase
+from .base import DiscardMessages, ItemCollection, ZWaveBase
 from .const import EMPTY_PAYLOAD
+from .fields import reduce_heavy_fields
 from .models.instance import OZWInstance
 from .options import OZWOptions
+from .router import TopicRouter
 
 if TYPE_CHECKING:
-    from .base import DiscardMessages, EventMessages  # noqa: F401
+    from .base import EventMessages  # noqa: F401
 
 
 class OZWManager(ZWaveBase):
     """Manager that holds the OZW instances connected to MQTT."""
 
+    __slots__ = ("router", "unconfirmed_topics")
+
     DIRECT_COLLECTION = "instance"
     DEFAULT_VALUE: Optional[dict] = None
     EVENT_CHANGED = "manager_placeholder_event"
@@ -22,6 +26,10 @@ class OZWManager(ZWaveBase):
     def __init__(self, options: OZWOptions):
         """Initialize class."""
         super().__init__(options, None, options.topic_prefix, None)
+        self.router = TopicRouter(self)
+        # Relative topics of objects restored from a snapshot that no message has
+        # been received for since. None if no snapshot was loaded.
+        self.unconfirmed_topics: Optional[Set[str]] = None
 
     def create_collections(
         self,
@@ -32,23 +40,157 @@ class OZWManager(ZWaveBase):
         """Create collections that the manager supports."""
         return {"instance": ItemCollection(OZWInstance)}
 
-    def receive_message(self, topic: str, message: str) -> None:
-        """Receive an MQTT message."""
+    def receive_message(self, topic: str, message: Union[str, bytes]) -> None:
+        """Receive an MQTT message with a str or bytes payload."""
+        relative_topic = self.relative_topic(topic)
+        metrics = self.options.metrics
+
+        if metrics is not None:
+            self._measure(relative_topic, message, None)
+        elif relative_topic is not None:
+            self.process_payload(relative_topic, self.options.decode(message))
+
+        if self.options.flush_batches_per_message:
+            self.options.flush_unscheduled_batches()
+
+    def receive_payload(self, topic: str, payload: dict) -> None:
+        """Receive an MQTT message with a payload that is already decoded."""
+        relative_topic = self.relative_topic(topic)
+
+        if self.options.metrics is not None:
+            self._measure(relative_topic, None, payload)
+        elif relative_topic is not None:
+            self.process_payload(relative_topic, payload)
+
+        if self.options.flush_batches_per_message:
+            self.options.flush_unscheduled_batches()
+
+    def _measure(
+        self,
+        relative_topic: Optional[str],
+        message: Optional[Union[str, bytes]],
+        payload: Optional[dict],
+    ) -> None:
+        """Process a message or a decoded payload and record it in the metrics."""
+        metrics = self.options.metrics
+        assert metrics is not None
+
+        if relative_topic is None:
+            metrics.filtered += 1
+            return
+
+        start = time.perf_counter()
+        decode_time = None
+
+        if payload is None:
+            assert message is not None
+            payload = self.options.decode(message)
+            decode_time = time.perf_counter() - start
+            start += decode_time
+
+        metrics.listener_time = 0.0
+        self.process_payload(relative_topic, payload)
+        metrics.record(
+            relative_topic,
+            0 if message is None else len(message),
+            decode_time,
+            time.perf_counter() - start,
+        )
+
+    def relative_topic(self, topic: str) -> Optional[str]:
+        """Return the topic without prefix and trailing slash.
+
+        Return None if the topic belongs to an OZW instance that is filtered out.
+        """
         assert topic.startswith(self.options.topic_prefix)
 
-        topic_parts_raw = topic[len(self.options.topic_prefix) :].split("/")
+        topic = topic[len(self.options.topic_prefix) :]
         instance_id = self.options.instance_id
 
-        if instance_id is not None and topic_parts_raw[0] != str(instance_id):
+        if instance_id is not None and topic.partition("/")[0] != str(instance_id):
+            return None
+
+        if topic[-1:] == "/":
+            topic = topic[:-1]
+
+        return topic
+
+    def process_payload(self, topic: str, payload: dict) -> None:
+        """Process a decoded payload for a topic relative to the topic prefix."""
+        if self.unconfirmed_topics:
+            confirm_topic(self.unconfirmed_topics, topic, payload)
+
+        if self.options.heavy_fields and payload is not EMPTY_PAYLOAD:
+            reduce_heavy_fields(
+                payload, self.options.heavy_fields, self.options.heavy_field_mode
+            )
+
+        if self.router.route(topic, payload):
             return
 
-        if topic_parts_raw[-1] == "":
-            topic_parts_raw.pop()
-        topic_parts = deque(topic_parts_raw)
+        self.process_message(deque(topic.split("/")) if topic else deque(), payload)
+
+        if payload is not EMPTY_PAYLOAD:
+            self.router.learn(topic)
+
+    def subscription_topics(self, statistics: bool = True) -> List[str]:
+        """Return MQTT topic filters for the messages that the models handle.
+
+        Only the instance of options.instance_id is subscribed to, if set.
+        Command topics are left out, and statistics if statistics is False.
+        """
+        instance_id = self.options.instance_id
+        skipped = () if statistics else ("statistics",)
+        instance = OZWInstance(
+            self.options,
+            self,
+            "+" if instance_id is None else str(instance_id),
+            instance_id,
+        )
+        return topic_filters(instance, skipped)[0]
+
+
+def confirm_topic(unconfirmed: Set[str], topic: str, payload: dict) -> None:
+    """Confirm the object of a topic and, unless it is removed, its ancestors."""
+    unconfirmed.discard(topic)
 
-        if message == "":
-            payload = EMPTY_PAYLOAD
+    if payload is EMPTY_PAYLOAD:
+        return
+
+    # A message for an object means that the objects above it still exist.
+    while "/" in topic:
+        topic = topic.rpartition("/")[0]
+        unconfirmed.discard(topic)
+
+
+def topic_filters(model: ZWaveBase, skipped: Tuple[str, ...]) -> Tuple[List[str], bool]:
+    """Return topic filters for the topics of a model and its descendants.
+
+    Items in collections are matched with a single level wildcard. Return if the
+    filters cover all topics below the model, so that the caller can use a multi
+    level wildcard instead.
+    """
+    filters = [f"{model.topic}/"]
+    complete = True
+
+    for name, child in model.collections.items():
+        if isinstance(child, DiscardMessages) or name in skipped:
+            complete = False
+            continue
+
+        if isinstance(child, ItemCollection):
+            topic_part = "+" if child.topic_part is None else f"{child.topic_part}/+"
+            # Stand-in item to build the topics of its descendants from.
+            child = child.item_class(model.options, model, topic_part, 0)
+
+        if isinstance(child, ZWaveBase):
+            child_filters, child_complete = topic_filters(child, skipped)
+            filters.extend(child_filters)
+            complete = complete and child_complete
         else:
-            payload = json.loads(message)
+            filters.append(f"{model.topic}/{name}/#")
+
+    if complete:
+        return [f"{model.topic}/#"], True
 
-        self.process_message(topic_parts, payload)
+    return filters, False
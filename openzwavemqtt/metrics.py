@@ -0,0 +1,217 @@
+"""Measure how received messages are processed."""
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds of the histogram buckets in seconds.
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """Histogram of durations in seconds."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize the histogram."""
+        self.buckets = tuple(buckets)
+        # The last count is for durations above the last bucket.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, duration: float) -> None:
+        """Add a duration."""
+        self.counts[bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.sum += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percentile: float) -> float:
+        """Return the upper bound of the bucket that holds a percentile.
+
+        Durations above the last bucket are reported as the maximum.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = percentile / 100 * self.count
+        seen = 0
+
+        for bucket, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket, self.max)
+
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, sum, max and percentiles."""
+        summary = {"count": self.count, "sum": self.sum, "max": self.max}
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}"] = self.percentile(percentile)
+        return summary
+
+    def prometheus(self, name: str) -> List[str]:
+        """Return the histogram in the Prometheus text format."""
+        lines = [f"# TYPE {name} histogram"]
+        cumulative = 0
+
+        for bucket, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bucket}"}} {cumulative}')
+
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.sum}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+class ListenerProfile:
+    """Calls and time of a listener for an event."""
+
+    __slots__ = ("calls", "total", "max", "slow_calls")
+
+    def __init__(self) -> None:
+        """Initialize the profile."""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Calls that took longer than the slow listener threshold.
+        self.slow_calls = 0
+
+    def observe(self, duration: float) -> None:
+        """Add a call."""
+        self.calls += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+
+class ReceiveMetrics:
+    """Counters and timings of received messages.
+
+    Pass it to OZWOptions. Messages are counted by topic class, the topic with
+    ids replaced by ``+``, e.g. ``+/node/+/statistics``, and by node. Timings:
+
+    - decode: decoding the payload.
+    - tree: processing the message in the model tree, without listeners.
+    - listeners: calling listeners. Listeners of an AsyncDispatcher are not
+      included.
+    - total: all of the above.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize the metrics."""
+        self.messages: Counter = Counter()
+        self.bytes: Counter = Counter()
+        self.messages_by_node: Counter = Counter()
+        # Messages for OZW instances that are filtered out.
+        self.filtered = 0
+
+        self.decode = Histogram(buckets)
+        self.tree = Histogram(buckets)
+        self.listeners = Histogram(buckets)
+        self.total = Histogram(buckets)
+
+        # Listener time of the message that is being processed.
+        self.listener_time = 0.0
+
+    def record(
+        self,
+        topic: str,
+        size: int,
+        decode_time: Optional[float],
+        process_time: float,
+    ) -> None:
+        """Record a message for a topic relative to the topic prefix.
+
+        Decode time is None for payloads that were decoded by the caller.
+        Process time includes the time spent in listeners.
+        """
+        parts = topic.split("/")
+        topic_class = "/".join(["+" if part.isnumeric() else part for part in parts])
+        self.messages[topic_class] += 1
+        self.bytes[topic_class] += size
+
+        if (
+            len(parts) > 2
+            and parts[0].isnumeric()
+            and parts[1] == "node"
+            and parts[2].isnumeric()
+        ):
+            self.messages_by_node[(int(parts[0]), int(parts[2]))] += 1
+
+        total = process_time
+        if decode_time is not None:
+            self.decode.observe(decode_time)
+            total += decode_time
+
+        self.tree.observe(process_time - self.listener_time)
+        self.listeners.observe(self.listener_time)
+        self.total.observe(total)
+
+    def busiest_nodes(self, count: int = 10) -> List[Tuple[Tuple[int, int], int]]:
+        """Return the (instance id, node id) with the most messages."""
+        return self.messages_by_node.most_common(count)
+
+    def summary(self) -> dict:
+        """Return the metrics as a dict."""
+        return {
+            "messages": dict(self.messages),
+            "bytes": dict(self.bytes),
+            "filtered": self.filtered,
+            "busiest_nodes": self.busiest_nodes(),
+            "decode": self.decode.summary(),
+            "tree": self.tree.summary(),
+            "listeners": self.listeners.summary(),
+            "total": self.total.summary(),
+        }
+
+    def prometheus(self, prefix: str = "ozw") -> str:
+        """Return the metrics in the Prometheus text format."""
+        lines = [f"# TYPE {prefix}_messages_total counter"]
+        lines.extend(
+            f'{prefix}_messages_total{{topic_class="{topic_class}"}} {count}'
+            for topic_class, count in self.messages.items()
+        )
+        lines.append(f"# TYPE {prefix}_message_bytes_total counter")
+        lines.extend(
+            f'{prefix}_message_bytes_total{{topic_class="{topic_class}"}} {size}'
+            for topic_class, size in self.bytes.items()
+        )
+        lines.append(f"# TYPE {prefix}_node_messages_total counter")
+        lines.extend(
+            f'{prefix}_node_messages_total{{instance="{instance_id}",'
+            f'node="{node_id}"}} {count}'
+            for (instance_id, node_id), count in self.messages_by_node.items()
+        )
+        lines.append(f"# TYPE {prefix}_filtered_messages_total counter")
+        lines.append(f"{prefix}_filtered_messages_total {self.filtered}")
+
+        for name in ("decode", "tree", "listeners", "total"):
+            histogram: Histogram = getattr(self, name)
+            lines.extend(histogram.prometheus(f"{prefix}_{name}_seconds"))
+
+        return "\n".join(lines) + "\n"
@@ -1,7 +1,7 @@
 """Model for the CommandClass."""
-from typing import Optional
+from typing import Dict, Optional
 
-from ..base import ItemCollection
+from ..base import ItemCollection, cached_data_property, reindex
 from ..const import (
     EVENT_COMMAND_CLASS_ADDED,
     EVENT_COMMAND_CLASS_CHANGED,
@@ -17,26 +17,41 @@ from .value import OZWValue
 class OZWCommandClass(OZWNodeChildBase):
     """Model for the OZW CommandClass."""
 
+    __slots__ = ("values_by_index", "lazy_values_by_index")
+
+    SCOPE_FIELD = "command_class"
+
     EVENT_ADDED = EVENT_COMMAND_CLASS_ADDED
     EVENT_CHANGED = EVENT_COMMAND_CLASS_CHANGED
     EVENT_REMOVED = EVENT_COMMAND_CLASS_REMOVED
 
     PLURAL_NAME = "commandclasses"
 
+    def _init_state(self) -> None:
+        """Initialize the indexes of values."""
+        # Values of this CommandClass by their Index.
+        self.values_by_index: Dict[int, OZWValue] = {}
+        # Ids of values that are held as payload by their Index.
+        self.lazy_values_by_index: Dict[int, int] = {}
+
     @property
     def instance(self) -> int:
         """Return Instance."""
         return self.data.get("Instance")
 
-    @property
+    @cached_data_property
     def command_class_id(self) -> CommandClass:
         """Return CommandClassId as CommandClass Enum."""
+        command_class_id = self.data.get("CommandClassId")
         try:
-            return CommandClass(self.data.get("CommandClassId"))
+            return CommandClass(command_class_id)
         except ValueError:
-            LOGGER.warning(
-                "Unknown CommandClass found: %s", self.data.get("CommandClassId")
-            )
+            ozw_instance = self._ozw_instance
+            if ozw_instance is None:
+                LOGGER.warning("Unknown CommandClass found: %s", command_class_id)
+            elif command_class_id not in ozw_instance.unknown_command_classes:
+                ozw_instance.unknown_command_classes.add(command_class_id)
+                LOGGER.warning("Unknown CommandClass found: %s", command_class_id)
             return CommandClass.UNKNOWN
 
     @property
@@ -54,13 +69,41 @@ class OZWCommandClass(OZWNodeChildBase):
         """Create collections that Node supports."""
         return {"value": ItemCollection(OZWValue)}
 
+    def add_to_indexes(self):
+        """Add this CommandClass to the indexes of its NodeInstance and Node."""
+        self._reindex(None, self.data.get("CommandClassId"))
+
+    def update_indexes(self, old_data):
+        """Update the indexes of the NodeInstance and Node."""
+        old_id = old_data.get("CommandClassId")
+        command_class_id = self.data.get("CommandClassId")
+        if command_class_id != old_id:
+            self._reindex(old_id, command_class_id)
+
+    def remove_from_indexes(self):
+        """Remove this CommandClass from the indexes of its NodeInstance and Node."""
+        self._reindex(self.data.get("CommandClassId"), None)
+
+    def _reindex(self, old_id: Optional[int], command_class_id: Optional[int]) -> None:
+        """Move this CommandClass to another CommandClassId in the indexes."""
+        reindex(self.parent.command_classes_by_id, self, old_id, command_class_id)
+
+        # The node index is keyed by CommandClassId, then by NodeInstance.
+        endpoints_by_id = self.node.command_class_endpoints
+        if old_id in endpoints_by_id:
+            endpoints = endpoints_by_id[old_id]
+            reindex(endpoints, self, self.parent.id, None)
+            if not endpoints:
+                del endpoints_by_id[old_id]
+        if command_class_id is not None:
+            endpoints_by_id.setdefault(command_class_id, {})[self.parent.id] = self
+
     def get_value_by_index(self, value_index: ValueIndex) -> Optional[OZWValue]:
         """Return a specific OZWValue on this CommandClass (if exists)."""
-        # pylint: disable=no-member
-        for value in self.values():
-            if value.index == value_index:
-                return value
-        return None
+        item_id = self.lazy_values_by_index.get(value_index)
+        if item_id is not None:
+            self.collections["value"].materialize(item_id)
+        return self.values_by_index.get(value_index)
 
     def has_value(self, value_index: ValueIndex) -> bool:
         """Determine if the CommandClass has the given ValueIndex."""
@@ -1,5 +1,5 @@
 """Model for the OZW instance level."""
-from typing import Dict, Optional, Type, Union
+from typing import Dict, Optional, Set, Type, Union
 
 from .. import base
 from ..const import (
@@ -11,17 +11,37 @@ from ..const import (
 from .instance_statistics import OZWInstanceStatistics
 from .instance_status import OZWInstanceStatus
 from .node import OZWNode
+from .value import OZWValue
 
 
 class OZWInstance(base.ZWaveBase):
     """Model for the OZW instance level."""
 
+    __slots__ = (
+        "values_by_id_key",
+        "lazy_values",
+        "command_topics",
+        "unknown_command_classes",
+    )
+
     DEFAULT_VALUE: Optional[dict] = None
+    SCOPE_FIELD = "instance_id"
 
     EVENT_ADDED = EVENT_INSTANCE_ADDED
     EVENT_CHANGED = EVENT_INSTANCE_CHANGED
     EVENT_REMOVED = EVENT_INSTANCE_REMOVED
 
+    def _init_state(self) -> None:
+        """Initialize the indexes of values, the command topics and unknown ids."""
+        # All values of this instance by their ValueIDKey, which is also their id.
+        self.values_by_id_key: Dict[int, OZWValue] = {}
+        # Collections of values that are held as payload, by ValueIDKey.
+        self.lazy_values: Dict[int, base.ItemCollection] = {}
+        # Topics of commands that have been sent, by command.
+        self.command_topics: Dict[str, str] = {}
+        # CommandClassIds that were logged as unknown.
+        self.unknown_command_classes: Set[int] = set()
+
     def create_collections(
         self,
     ) -> Dict[
@@ -44,13 +64,25 @@ class OZWInstance(base.ZWaveBase):
             ),
         }
 
+    def get_value_by_id_key(self, value_id_key: int) -> Optional[OZWValue]:
+        """Return the OZWValue with the given ValueIDKey (if exists)."""
+        if value_id_key in self.lazy_values:
+            self.lazy_values[value_id_key].materialize(value_id_key)
+
+        return self.values_by_id_key.get(value_id_key)
+
     def send_command(self, command: str, payload: Optional[dict] = None) -> None:
         """Send command to the OZW instance."""
         if payload is None:
             payload = {}
-        topic_prefix = self.options.topic_prefix
-        full_topic = f"{topic_prefix}{self.id}/command/{command}/"
-        self.options.send_message(full_topic, payload)
+        self.options.send_message(self.get_command_topic(command), payload)
+
+    def get_command_topic(self, command: str) -> str:
+        """Return the topic of a command for the OZW instance."""
+        topic = self.command_topics.get(command)
+        if topic is None:
+            topic = self.command_topics[command] = f"{self.topic}/command/{command}/"
+        return topic
 
     # Shortcut methods to some common used (global) controller commands
     # https://github.com/OpenZWave/qt-openzwave/blob/master/docs/MQTT.md#mqtt-commands
@@ -6,6 +6,8 @@ from .node_child_base import OZWNodeChildBase
 class OZWInstanceStatistics(OZWNodeChildBase):
     """Model for OZW Instance statistics."""
 
+    __slots__ = ()
+
     EVENT_CHANGED = EVENT_INSTANCE_STATISTICS_CHANGED
 
     @property
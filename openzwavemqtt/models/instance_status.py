@@ -6,6 +6,8 @@ from ..const import EVENT_INSTANCE_STATUS_CHANGED
 class OZWInstanceStatus(base.ZWaveBase):
     """Model for OZW Instance Status."""
 
+    __slots__ = ()
+
     EVENT_CHANGED = EVENT_INSTANCE_STATUS_CHANGED
 
     @property
@@ -1,5 +1,5 @@
 """Model for a OZW Node."""
-from typing import Iterable, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
 from ..base import ItemCollection, ZWaveBase
 from ..const import (
@@ -19,10 +19,19 @@ from .value import OZWValue
 class OZWNode(ZWaveBase):
     """Model for a Z-Wave Node."""
 
+    __slots__ = ("command_class_endpoints",)
+
+    SCOPE_FIELD = "node_id"
+
     EVENT_ADDED = EVENT_NODE_ADDED
     EVENT_CHANGED = EVENT_NODE_CHANGED
     EVENT_REMOVED = EVENT_NODE_REMOVED
 
+    def _init_state(self) -> None:
+        """Initialize the index of command classes."""
+        # CommandClasses of all NodeInstances by CommandClassId, then by NodeInstance.
+        self.command_class_endpoints: Dict[int, Dict[int, OZWCommandClass]] = {}
+
     @property
     def node_id(self) -> int:
         """Return NodeID."""
@@ -229,13 +238,22 @@ class OZWNode(ZWaveBase):
     def get_command_class(
         self, command_class_id: CommandClass, instance_id: Optional[int] = None
     ) -> Optional[OZWCommandClass]:
-        """Return a specific CommandClass on this node (if exists)."""
-        # pylint: disable=no-member
-        for instance in self.instances():
-            if instance_id is not None and instance.instance != instance_id:
-                continue
-            return instance.get_command_class(command_class_id)
-        return None
+        """Return a specific CommandClass on this node (if exists).
+
+        Without instance_id, the CommandClass of the lowest NodeInstance is returned.
+        """
+        endpoints = self.command_class_endpoints.get(command_class_id)
+        if not endpoints:
+            return None
+        if instance_id is None:
+            return endpoints[min(endpoints)]
+        return endpoints.get(instance_id)
+
+    def get_command_class_endpoints(
+        self, command_class_id: CommandClass
+    ) -> Dict[int, OZWCommandClass]:
+        """Return the CommandClass on every NodeInstance that has it, by NodeInstance."""
+        return dict(self.command_class_endpoints.get(command_class_id, {}))
 
     def has_command_class(
         self, command_class_id: CommandClass, instance_id: Optional[int] = None
@@ -10,6 +10,8 @@ from .node_child_base import OZWNodeChildBase
 class OZWNodeAssociation(OZWNodeChildBase):
     """Model for Node Associations."""
 
+    __slots__ = ()
+
     EVENT_ADDED = EVENT_NODE_ASSOCIATION_ADDED
     EVENT_CHANGED = EVENT_NODE_ASSOCIATION_CHANGED
     EVENT_REMOVED = EVENT_NODE_ASSOCIATION_REMOVED
@@ -1,27 +1,46 @@
 """Base class with Node specific helpers."""
 
-from typing import cast
+from typing import Optional, Type
 
 from ..base import ZWaveBase
+from ..options import OZWOptions
 
 
 class OZWNodeChildBase(ZWaveBase):
     """Base class for objects that are descendants of a Node object."""
 
-    @property
-    def node(self):
-        """Return the node that this child belongs to."""
-        from .node import OZWNode
+    __slots__ = ("_node", "_ozw_instance")
 
-        parent = self.parent
+    def __init__(
+        self,
+        options: OZWOptions,
+        parent: Optional[ZWaveBase],
+        topic_part: str,
+        item_id: Optional[int],
+    ):
+        """Initialize the child and resolve the node and OZW instance it belongs to."""
+        # Resolved before children are created, which take them from this object.
+        try:
+            # pylint: disable=protected-access
+            self._node = parent._node  # type: ignore
+            self._ozw_instance = parent._ozw_instance  # type: ignore
+        except AttributeError:
+            # The parent is not a child of a node.
+            from .instance import OZWInstance
+            from .node import OZWNode
 
-        while parent is not None and not isinstance(parent, OZWNode):
-            parent = parent.parent
+            self._node = find_ancestor(parent, OZWNode)
+            self._ozw_instance = find_ancestor(parent, OZWInstance)
 
-        if isinstance(parent, OZWNode):
-            return cast(OZWNode, parent)
+        super().__init__(options, parent, topic_part, item_id)
 
-        raise RuntimeError("Object is not a descendant of a Node")
+    @property
+    def node(self):
+        """Return the node that this child belongs to."""
+        if self._node is None:
+            raise RuntimeError("Object is not a descendant of a Node")
+
+        return self._node
 
     def __repr__(self):
         """Return a representation of this object."""
@@ -33,3 +52,13 @@ class OZWNodeChildBase(ZWaveBase):
             node = "<missing> (bad!)"
 
         return f"<{type(self).__name__}{iden} (node: {node})>"
+
+
+def find_ancestor(
+    model: Optional[ZWaveBase], model_class: Type[ZWaveBase]
+) -> Optional[ZWaveBase]:
+    """Return the model or its first ancestor that is an instance of model_class."""
+    while model is not None and not isinstance(model, model_class):
+        model = model.parent
+
+    return model
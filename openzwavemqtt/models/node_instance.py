@@ -1,5 +1,5 @@
 """Model for the Node instance level."""
-from typing import Optional
+from typing import Dict, Optional
 
 from ..base import ItemCollection
 from ..const import (
@@ -17,10 +17,17 @@ from .value import OZWValue
 class OZWNodeInstance(OZWNodeChildBase):
     """Model for Node Instance."""
 
+    __slots__ = ("command_classes_by_id",)
+
     EVENT_ADDED = EVENT_NODE_INSTANCE_ADDED
     EVENT_CHANGED = EVENT_NODE_INSTANCE_CHANGED
     EVENT_REMOVED = EVENT_NODE_INSTANCE_REMOVED
 
+    def _init_state(self) -> None:
+        """Initialize the index of command classes."""
+        # CommandClasses of this NodeInstance by their CommandClassId.
+        self.command_classes_by_id: Dict[int, OZWCommandClass] = {}
+
     @property
     def instance(self) -> int:
         """Return Instance."""
@@ -39,11 +46,7 @@ class OZWNodeInstance(OZWNodeChildBase):
         self, command_class_id: CommandClass
     ) -> Optional[OZWCommandClass]:
         """Return a specific CommandClass on this NodeInstance (if exists)."""
-        # pylint: disable=no-member
-        for command_class in self.commandclasses():
-            if command_class.command_class_id == command_class_id:
-                return command_class
-        return None
+        return self.command_classes_by_id.get(command_class_id)
 
     def has_command_class(self, command_class_id: CommandClass) -> bool:
         """Determine if the node has the given CommandClass."""
@@ -54,7 +57,7 @@ class OZWNodeInstance(OZWNodeChildBase):
     ) -> Optional[OZWValue]:
         """Return a specific OZWValue on this node (if exists)."""
         command_class = self.get_command_class(command_class_id)
-        return command_class.get_value(value_index) if command_class else None
+        return command_class.get_value_by_index(value_index) if command_class else None
 
     def has_value(
         self, command_class_id: CommandClass, value_index: ValueIndex
@@ -8,6 +8,8 @@ from ..const import EVENT_NODE_ADDED, EVENT_NODE_REMOVED, EVENT_NODE_STATISTICS_
 class OZWNodeStatistics(ZWaveBase):
     """Model for Node Statistics."""
 
+    __slots__ = ()
+
     EVENT_ADDED = EVENT_NODE_ADDED
     EVENT_CHANGED = EVENT_NODE_STATISTICS_CHANGED
     EVENT_REMOVED = EVENT_NODE_REMOVED
@@ -1,9 +1,12 @@
 """Model for the Value."""
-from typing import Any, cast, Optional
+from typing import Any, Optional
 
+from ..base import cached_data_property, reindex
 from ..const import (
+    EVENT_LAZY_VALUE_ADDED,
     EVENT_VALUE_ADDED,
     EVENT_VALUE_CHANGED,
+    EVENT_VALUE_DELTA,
     EVENT_VALUE_REMOVED,
     CommandClass,
     ValueGenre,
@@ -15,9 +18,15 @@ from .node_child_base import OZWNodeChildBase
 class OZWValue(OZWNodeChildBase):
     """Representation of an OpenZWave Value object."""
 
+    __slots__ = ()
+
+    SCOPE_FIELD = "value_id_key"
+
     EVENT_ADDED = EVENT_VALUE_ADDED
     EVENT_CHANGED = EVENT_VALUE_CHANGED
+    EVENT_DELTA = EVENT_VALUE_DELTA
     EVENT_REMOVED = EVENT_VALUE_REMOVED
+    EVENT_LAZY_ADDED = EVENT_LAZY_VALUE_ADDED
 
     @property
     def label(self) -> str:
@@ -44,7 +53,7 @@ class OZWValue(OZWNodeChildBase):
         """Return Max."""
         return self.data.get("Max")
 
-    @property
+    @cached_data_property
     def type(self) -> ValueType:
         """Return Type."""
         try:
@@ -67,7 +76,7 @@ class OZWValue(OZWNodeChildBase):
         """Return Index."""
         return self.data["Index"]
 
-    @property
+    @cached_data_property
     def genre(self) -> ValueGenre:
         """Return Genre."""
         try:
@@ -123,18 +132,66 @@ class OZWValue(OZWNodeChildBase):
     @property
     def ozw_instance(self):
         """Return OZWInstance this value belongs to."""
-        from .instance import OZWInstance
-
-        parent = self.parent
-        while parent is not None and not isinstance(parent, OZWInstance):
-            parent = parent.parent
-
-        if isinstance(parent, OZWInstance):
-            return cast(OZWInstance, parent)
+        return self._ozw_instance
+
+    def add_to_indexes(self):
+        """Add this value to the indexes of its OZWInstance and CommandClass."""
+        ozw_instance = self.ozw_instance
+        if ozw_instance is not None:
+            ozw_instance.values_by_id_key[self.id] = self
+        reindex(self.parent.values_by_index, self, None, self.data.get("Index"))
+
+    def update_indexes(self, old_data):
+        """Update the Index index of the CommandClass."""
+        old_index = old_data.get("Index")
+        index = self.data.get("Index")
+        if index != old_index:
+            reindex(self.parent.values_by_index, self, old_index, index)
+
+    def remove_from_indexes(self):
+        """Remove this value from the indexes of its OZWInstance and CommandClass."""
+        ozw_instance = self.ozw_instance
+        if ozw_instance is not None:
+            ozw_instance.values_by_id_key.pop(self.id, None)
+        reindex(self.parent.values_by_index, self, self.data.get("Index"), None)
+
+    @classmethod
+    def add_lazy_to_indexes(cls, collection, item_id):
+        """Add a held value to the indexes of its OZWInstance and CommandClass."""
+        # pylint: disable=protected-access
+        ozw_instance = collection.parent._ozw_instance
+        if ozw_instance is not None:
+            ozw_instance.lazy_values[item_id] = collection
+        index = collection.lazy_payloads[item_id].get("Index")
+        if index is not None:
+            collection.parent.lazy_values_by_index[index] = item_id
+
+    @classmethod
+    def update_lazy_indexes(cls, collection, item_id, old_payload):
+        """Update the Index index of the CommandClass for a held value."""
+        old_index = old_payload.get("Index")
+        index = collection.lazy_payloads[item_id].get("Index")
+        if index != old_index:
+            lazy_values_by_index = collection.parent.lazy_values_by_index
+            if lazy_values_by_index.get(old_index) == item_id:
+                del lazy_values_by_index[old_index]
+            if index is not None:
+                lazy_values_by_index[index] = item_id
+
+    @classmethod
+    def remove_lazy_from_indexes(cls, collection, item_id):
+        """Remove a held value from the indexes of its OZWInstance and CommandClass."""
+        # pylint: disable=protected-access
+        ozw_instance = collection.parent._ozw_instance
+        if ozw_instance is not None:
+            ozw_instance.lazy_values.pop(item_id, None)
+        index = collection.lazy_payloads[item_id].get("Index")
+        lazy_values_by_index = collection.parent.lazy_values_by_index
+        if index is not None and lazy_values_by_index.get(index) == item_id:
+            del lazy_values_by_index[index]
 
     def send_value(self, new_value):
         """Send an updated value to MQTT."""
-        instance_id = self.ozw_instance.id
-        full_topic = f"{self.options.topic_prefix}{instance_id}/command/setvalue/"
+        full_topic = self.ozw_instance.get_command_topic("setvalue")
         payload = {"ValueIDKey": self.value_id_key, "Value": new_value}
         self.options.send_message(full_topic, payload)
@@ -1,8 +1,54 @@
 """Options for the OZW MQTT Connection."""
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
+import asyncio
+import json
+import time
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .const import EMPTY_PAYLOAD, HEAVY_FIELD_MODES, HEAVY_FIELD_STRIP, LOGGER
+from .fields import decode_without_heavy_fields
+from .metrics import ListenerProfile
 
 if TYPE_CHECKING:
-    from .base import ZWaveBase  # noqa: F401
+    from .base import DataDelta, LazyItem, ZWaveBase  # noqa: F401
+    from .dispatcher import AsyncDispatcher  # noqa: F401
+    from .metrics import ReceiveMetrics  # noqa: F401
+
+# Listeners may be coroutine functions when using an AsyncDispatcher.
+EventData = Union[dict, "ZWaveBase", "DataDelta", "LazyItem"]
+Listener = Callable[[EventData], Any]
+BatchListener = Callable[[List[EventData]], None]
+Decoder = Callable[[Union[str, bytes]], Any]
+
+try:
+    import orjson
+
+    DEFAULT_DECODER: Decoder = orjson.loads
+except ImportError:
+    DEFAULT_DECODER = json.loads
+
+
+class ListenerScope(NamedTuple):
+    """Ids that a listener is scoped to, or that the object of an event has."""
+
+    instance_id: Optional[int] = None
+    node_id: Optional[int] = None
+    command_class: Optional[int] = None
+    value_id_key: Optional[int] = None
 
 
 class OZWOptions:
@@ -13,24 +59,313 @@ class OZWOptions:
         send_message: Callable[[str, Union[str, dict]], None],
         topic_prefix: str = "OpenZWave/",
         instance_id: Optional[int] = None,
+        batch_size: int = 1000,
+        dispatcher: Optional["AsyncDispatcher"] = None,
+        decoder: Optional[Decoder] = None,
+        heavy_fields: Sequence[Tuple[str, ...]] = (),
+        heavy_field_mode: str = HEAVY_FIELD_STRIP,
+        suppress_unchanged: bool = True,
+        volatile_keys: Iterable[str] = (),
+        metrics: Optional["ReceiveMetrics"] = None,
+        profile_listeners: bool = False,
+        slow_listener_threshold: Optional[float] = None,
+        lazy_values: bool = False,
+        flush_batches_per_message: bool = False,
     ):
         """Initialize class."""
         self.send_message = send_message
         self.topic_prefix = topic_prefix
-        self.listeners: Dict[str, List[Callable[[Union[dict, "ZWaveBase"]], None]]] = {}
+        self.listeners: Dict[str, List[Listener]] = {}
+        # Scoped listeners by event, then by the scope fields that are set,
+        # then by scope.
+        self.scoped_listeners: Dict[
+            str, Dict[Tuple[bool, ...], Dict[tuple, List[Listener]]]
+        ] = {}
         self.instance_id = instance_id
+        # Call listeners from an asyncio task instead of while processing messages.
+        self.dispatcher = dispatcher
+        # Decoder of JSON payloads. Uses orjson if installed.
+        self.decoder = decoder or DEFAULT_DECODER
+        # Paths of payload fields that are stripped or lazily held,
+        # e.g. FIELD_PRODUCT_PIC.
+        self.heavy_fields = heavy_fields
+        self.heavy_field_mode = heavy_field_mode
+        # Skip changed events if no data changed except volatile keys,
+        # e.g. TimeStamp.
+        self.suppress_unchanged = suppress_unchanged
+        self.volatile_keys = frozenset(volatile_keys)
+        # Counters and timings of received messages.
+        self.metrics = metrics
+        # Calls and time per event and listener. A warning is logged for calls
+        # that take longer than slow_listener_threshold seconds.
+        self.profile_listeners = profile_listeners
+        self.slow_listener_threshold = slow_listener_threshold
+        self.listener_profiles: Dict[Tuple[str, Listener], ListenerProfile] = {}
+        # Hold values as payload until they are accessed or have listeners.
+        self.lazy_values = lazy_values
+
+        # Listeners that receive events in batches.
+        self.batch_listeners: Dict[str, List[BatchListener]] = {}
+        self.batch_size = batch_size
+        # Without a running asyncio loop, deliver batches after every message
+        # instead of once batch_size events are buffered.
+        self.flush_batches_per_message = flush_batches_per_message
+        # Buffered events for batch listeners, in order of arrival.
+        self.pending_batch: Dict[Hashable, Tuple[str, Any]] = {}
+        self.batch_flush_scheduled = False
 
         # Make sure topic prefix ends in a slash
         assert topic_prefix[-1] == "/"
+        assert heavy_field_mode in HEAVY_FIELD_MODES
+
+    def decode(self, message: Union[str, bytes]) -> dict:
+        """Decode the str or bytes payload of a message.
+
+        An empty payload means that the object was removed. Heavy fields are cut
+        out before decoding where possible.
+        """
+        if not message:
+            return EMPTY_PAYLOAD
+
+        if self.heavy_fields:
+            return decode_without_heavy_fields(
+                self.decoder, message, self.heavy_fields, self.heavy_field_mode
+            )
+
+        payload: dict = self.decoder(message)
+        return payload
 
     def listen(
-        self, event: str, listener: Callable[[Union[dict, "ZWaveBase"]], None]
+        self,
+        event: str,
+        listener: Listener,
+        *,
+        instance_id: Optional[int] = None,
+        node_id: Optional[int] = None,
+        command_class: Optional[int] = None,
+        value_id_key: Optional[int] = None,
     ) -> Callable[[], None]:
-        """Attach listener for events."""
-        self.listeners.setdefault(event, []).append(listener)
-        return lambda: self.listeners[event].remove(listener)
-
-    def notify(self, event: str, data: Union[dict, "ZWaveBase"]) -> None:
-        """Notify listeners of a new event."""
-        for listener in self.listeners.get(event, []):
-            listener(data)
+        """Attach listener for events.
+
+        Pass ids to only receive events for objects with those ids. Events for an
+        object are also received by listeners scoped to one of its ancestors.
+        """
+        scope = ListenerScope(instance_id, node_id, command_class, value_id_key)
+
+        if scope == ListenerScope():
+            self.listeners.setdefault(event, []).append(listener)
+            return lambda: remove_from(self.listeners, event, listener)
+
+        mask = tuple(field is not None for field in scope)
+        by_mask = self.scoped_listeners.setdefault(event, {})
+        by_scope = by_mask.setdefault(mask, {})
+        by_scope.setdefault(scope, []).append(listener)
+
+        def remove_listener() -> None:
+            """Remove the scoped listener and the containers it leaves empty."""
+            remove_from(by_scope, scope, listener)
+            if not by_scope:
+                del by_mask[mask]
+            if not by_mask:
+                del self.scoped_listeners[event]
+
+        return remove_listener
+
+    def listen_batch(self, event: str, listener: BatchListener) -> Callable[[], None]:
+        """Attach listener that receives events in batches.
+
+        Events are buffered and delivered as a list at the end of the current tick of
+        the running asyncio loop, once batch_size events are buffered or when
+        flush_batches is called. Changed events for the same object are coalesced;
+        the object holds its latest state.
+
+        Without a running asyncio loop, batches are only delivered once batch_size
+        events are buffered. Call flush_batches to deliver the rest, e.g. after
+        loading a dump. With flush_batches_per_message, the manager flushes
+        instead at the end of every received message.
+        """
+        self.batch_listeners.setdefault(event, []).append(listener)
+        return lambda: remove_from(self.batch_listeners, event, listener)
+
+    def flush_batches(self) -> None:
+        """Deliver buffered events to batch listeners."""
+        pending = list(self.pending_batch.values())
+        self.pending_batch.clear()
+        self.batch_flush_scheduled = False
+
+        # Consecutive events of the same type are delivered together.
+        for event, group in groupby(pending, key=itemgetter(0)):
+            batch = [data for _, data in group]
+            for listener in self.batch_listeners.get(event, []):
+                listener(batch)
+
+            if event.endswith("_changed"):
+                for data in batch:
+                    data.reset_changed_keys()
+
+    def flush_unscheduled_batches(self) -> None:
+        """Deliver buffered events that no running asyncio loop will flush."""
+        if self.pending_batch and not self.batch_flush_scheduled:
+            self.flush_batches()
+
+    def _add_to_batch(self, event: str, data: EventData) -> None:
+        """Buffer an event for batch listeners."""
+        # Changed events are keyed by their object, other events are never merged.
+        key: Hashable = (event, id(data)) if event.endswith("_changed") else object()
+
+        self.pending_batch.setdefault(key, (event, data))
+
+        if len(self.pending_batch) >= self.batch_size:
+            self.flush_batches()
+            return
+
+        if self.batch_flush_scheduled:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        loop.call_soon(self.flush_batches)
+        self.batch_flush_scheduled = True
+
+    def has_listeners(self, event: str) -> bool:
+        """Return if there may be listeners for an event."""
+        return (
+            event in self.listeners
+            or event in self.scoped_listeners
+            or event in self.batch_listeners
+        )
+
+    def has_listeners_for(self, event: str, data: EventData) -> bool:
+        """Return if there are listeners for an event of an object.
+
+        Scoped listeners only count if their scope matches the object.
+        """
+        if event in self.listeners or event in self.batch_listeners:
+            return True
+
+        return event in self.scoped_listeners and bool(
+            self.matching_listeners(event, data)
+        )
+
+    def notify(self, event: str, data: EventData) -> bool:
+        """Notify listeners of a new event.
+
+        Return if the event is batched or dispatched, and delivered later.
+        """
+        batched = event in self.batch_listeners
+        if batched:
+            self._add_to_batch(event, data)
+
+        listeners = self.matching_listeners(event, data)
+
+        if not listeners:
+            return batched
+
+        if self.dispatcher is not None:
+            self.dispatcher.put(event, data, listeners)
+            return True
+
+        if self.metrics is None and not self.profile_listeners:
+            for listener in listeners:
+                listener(data)
+            return batched
+
+        start = time.perf_counter()
+
+        if self.profile_listeners:
+            for listener in listeners:
+                self._call_profiled(event, listener, data)
+        else:
+            for listener in listeners:
+                listener(data)
+
+        if self.metrics is not None:
+            self.metrics.listener_time += time.perf_counter() - start
+
+        return batched
+
+    def _call_profiled(self, event: str, listener: Listener, data: EventData) -> None:
+        """Call a listener and record the call in its profile."""
+        start = time.perf_counter()
+        listener(data)
+        duration = time.perf_counter() - start
+
+        profile = self.listener_profiles.get((event, listener))
+        if profile is None:
+            profile = self.listener_profiles[(event, listener)] = ListenerProfile()
+        profile.observe(duration)
+
+        threshold = self.slow_listener_threshold
+        if threshold is not None and duration > threshold:
+            profile.slow_calls += 1
+            LOGGER.warning(
+                "Listener %s for %s took %.3f seconds",
+                listener_name(listener),
+                event,
+                duration,
+            )
+
+    def dump_listener_profiles(self) -> str:
+        """Return the listener profiles as a table, by cumulative time."""
+        lines = [
+            f"{'event':<32} {'listener':<48} {'calls':>8} {'total ms':>10} "
+            f"{'avg ms':>8} {'max ms':>8} {'slow':>6}"
+        ]
+        profiles = sorted(
+            self.listener_profiles.items(),
+            key=lambda item: item[1].total,
+            reverse=True,
+        )
+
+        for (event, listener), profile in profiles:
+            lines.append(
+                f"{event:<32} {listener_name(listener):<48} {profile.calls:>8} "
+                f"{profile.total * 1000:>10.3f} "
+                f"{profile.total / profile.calls * 1000:>8.3f} "
+                f"{profile.max * 1000:>8.3f} {profile.slow_calls:>6}"
+            )
+
+        return "\n".join(lines)
+
+    def matching_listeners(self, event: str, data: EventData) -> List[Listener]:
+        """Return the listeners for an event."""
+        listeners = list(self.listeners.get(event, []))
+        scoped_listeners = self.scoped_listeners.get(event)
+
+        if not scoped_listeners:
+            return listeners
+
+        # Plain dicts have no scope, the payloads of EventMessages do.
+        scope: Optional[ListenerScope] = getattr(data, "listener_scope", None)
+        if scope is None:
+            return listeners
+
+        for mask, by_scope in scoped_listeners.items():
+            key = tuple(field if is_set else None for field, is_set in zip(scope, mask))
+            listeners.extend(by_scope.get(key, []))
+
+        return listeners
+
+
+def remove_from(listeners: Dict[Any, List[Any]], key: Any, listener: Any) -> None:
+    """Remove a listener from a list in a dict, and the list once it is empty.
+
+    has_listeners relies on events without listeners not being in the dict.
+    """
+    listeners[key].remove(listener)
+    if not listeners[key]:
+        del listeners[key]
+
+
+def listener_name(listener: Listener) -> str:
+    """Return a readable name of a listener."""
+    module = getattr(listener, "__module__", None)
+    name = getattr(listener, "__qualname__", None)
+
+    if name is None:
+        return repr(listener)
+
+    return f"{module}.{name}" if module else name
@@ -0,0 +1,135 @@
+"""Route messages for known topics straight to the model that handles them."""
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from .base import ItemCollection, ZWaveBase
+from .const import EMPTY_PAYLOAD
+
+
+class TopicRouter:
+    """Cache of topics that can be processed without walking the model tree.
+
+    Topics are relative to the topic prefix and have no trailing slash.
+
+    Topics for items in a collection are keyed by the topic prefix of that
+    collection, e.g. ``1/node/2/instance/1/commandclass/37/value``. The last part of
+    the topic is the id of the item. New items in a known collection are created
+    through the route as well.
+
+    Topics for a single child of an item are keyed by the full topic, e.g.
+    ``1/node/2/statistics``.
+    """
+
+    def __init__(self, root: ZWaveBase):
+        """Initialize the router."""
+        self.root = root
+        self.collections: Dict[str, ItemCollection] = {}
+        self.children: Dict[str, Tuple[ItemCollection, int, str]] = {}
+
+    def route(self, topic: str, message: dict) -> bool:
+        """Process a message if the topic is known. Return if it was processed."""
+        if message is EMPTY_PAYLOAD:
+            # Removing an item detaches the tree below it.
+            self.forget(topic)
+            return False
+
+        prefix, _, last = topic.rpartition("/")
+
+        if last.isnumeric():
+            collection = self.collections.get(prefix)
+
+            if collection is None:
+                return False
+
+            collection.process_message(deque((last,)), message)
+            return True
+
+        child_route = self.children.get(topic)
+
+        if child_route is None:
+            return False
+
+        collection, item_id, child_name = child_route
+        item = collection.get(item_id)
+
+        if item is None:
+            return False
+
+        item.collections[child_name].process_message(deque(), message)
+        return True
+
+    def learn(self, topic: str) -> None:
+        """Learn the route of a topic that was processed by walking the tree."""
+        prefix, _, last = topic.rpartition("/")
+
+        if prefix in self.collections or topic in self.children:
+            return
+
+        parts: Deque[str] = deque(topic.split("/")) if topic else deque()
+        model = self.root
+        owner: Optional[Tuple[ItemCollection, int]] = None
+
+        while parts:
+            # Messages for children of this model are still held.
+            if model.data is EMPTY_PAYLOAD:
+                return
+
+            if parts[0] in model.collections:
+                child_name = parts.popleft()
+            elif model.DIRECT_COLLECTION and parts[0].isnumeric():
+                child_name = model.DIRECT_COLLECTION
+            else:
+                return
+
+            child = model.collections[child_name]
+
+            if isinstance(child, ZWaveBase):
+                if not parts and owner is not None:
+                    self.children[topic] = (*owner, child_name)
+                    return
+
+                # Only children of items in a collection can be validated.
+                model = child
+                owner = None
+                continue
+
+            if not isinstance(child, ItemCollection) or not parts:
+                return
+
+            item_part = parts.popleft()
+
+            if not parts:
+                if last.isnumeric():
+                    self.collections[prefix] = child
+                return
+
+            item = child.get(int(item_part))
+
+            if item is None:
+                return
+
+            model = item
+            owner = (child, int(item_part))
+
+    def forget(self, topic: str) -> None:
+        """Forget the routes into the part of the tree below a topic."""
+        below = f"{topic}/"
+
+        for prefix in [
+            prefix
+            for prefix in self.collections
+            if prefix == topic or prefix.startswith(below)
+        ]:
+            del self.collections[prefix]
+
+        for child_topic in [
+            child_topic
+            for child_topic in self.children
+            if child_topic == topic or child_topic.startswith(below)
+        ]:
+            del self.children[child_topic]
+
+    def clear(self) -> None:
+        """Forget all routes."""
+        self.collections.clear()
+        self.children.clear()
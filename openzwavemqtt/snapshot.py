@@ -0,0 +1,207 @@
+"""Save the state of a manager to a file and restore it for fast warm starts."""
+import gzip
+import json
+from collections import deque
+from typing import Any, List, Optional, Set
+
+from .base import ItemCollection, ZWaveBase
+from .const import EMPTY_PAYLOAD
+from .fields import LazyField, reduce_heavy_fields
+from .manager import OZWManager
+from .options import OZWOptions
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_model(model: ZWaveBase) -> dict:
+    """Return the state of a model and its descendants.
+
+    The state holds the data, messages held for children and the state of the
+    children by collection name and item id. Empty payloads, which remove an
+    object, are saved as None.
+    """
+    state: dict = {}
+
+    if model.data is not model.DEFAULT_VALUE:
+        state["data"] = snapshot_payload(model.data)
+
+    if model.pending_messages:
+        state["pending"] = [
+            [list(topic), snapshot_payload(message)]
+            for topic, message in model.pending_messages
+        ]
+
+    children = {}
+
+    for name, collection in model.collections.items():
+        if isinstance(collection, ZWaveBase):
+            child_state = snapshot_model(collection)
+        elif isinstance(collection, ItemCollection):
+            child_state = {
+                str(item_id): snapshot_model(item)
+                for item_id, item in collection.collection.items()
+            }
+            # Held items are saved as payload, without building their models.
+            for item_id, payload in (collection.lazy_payloads or {}).items():
+                child_state[str(item_id)] = {"data": payload}
+        else:
+            continue
+
+        if child_state:
+            children[name] = child_state
+
+    if children:
+        state["children"] = children
+
+    return state
+
+
+def restore_model(model: ZWaveBase, state: dict) -> None:
+    """Restore the state of a model and its descendants, without events."""
+    if "data" in state:
+        model.data = restore_data(model.options, state["data"])
+        model.data_cache = None
+
+    if "pending" in state:
+        model.pending_messages = [
+            (deque(topic), restore_data(model.options, message))
+            for topic, message in state["pending"]
+        ]
+
+    for name, child_state in state.get("children", {}).items():
+        collection = model.collections[name]
+
+        if isinstance(collection, ZWaveBase):
+            restore_model(collection, child_state)
+            continue
+
+        assert isinstance(collection, ItemCollection)
+
+        for item_id, item_state in child_state.items():
+            if collection.lazy_payloads is not None and item_state.keys() == {"data"}:
+                collection.hold(
+                    int(item_id), restore_data(model.options, item_state["data"])
+                )
+                continue
+
+            item = collection.create_item(int(item_id))
+            restore_model(item, item_state)
+            item.add_to_indexes()
+
+
+def snapshot_payload(payload: Optional[dict]) -> Optional[dict]:
+    """Return a payload to save, with None for an empty payload."""
+    return None if payload is EMPTY_PAYLOAD else payload
+
+
+def restore_data(options: OZWOptions, data: Optional[dict]) -> dict:
+    """Return restored data with heavy fields reduced.
+
+    None is restored as the empty payload that removes an object.
+    """
+    if data is None:
+        return EMPTY_PAYLOAD
+    if options.heavy_fields:
+        reduce_heavy_fields(data, options.heavy_fields, options.heavy_field_mode)
+    return data
+
+
+def save_snapshot(mgr: OZWManager, file_path: str) -> None:
+    """Save the state of a manager to a gzip compressed JSON file."""
+    snapshot = {"version": SNAPSHOT_VERSION, "state": snapshot_model(mgr)}
+
+    # json.dumps uses the C encoder, json.dump does not.
+    encoded = json.dumps(snapshot, separators=(",", ":"), default=encode_field)
+
+    with gzip.open(file_path, "wb", compresslevel=6) as fp:
+        fp.write(encoded.encode())
+
+
+def load_snapshot(mgr: OZWManager, file_path: str) -> None:
+    """Restore the state of a manager from a snapshot file.
+
+    The manager should be new. No events are fired for restored objects, walk
+    the tree once after loading. Messages received afterwards update the restored
+    objects and only fire events for actual changes.
+
+    Restored objects are unconfirmed until a message is received for them. Call
+    prune_unconfirmed once the broker has replayed the retained messages, to
+    remove objects that were removed while no messages were received.
+    """
+    if mgr.collections["instance"].collection:  # type: ignore
+        raise ValueError("Snapshots can only be loaded into an empty manager")
+
+    with gzip.open(file_path, "rb") as fp:
+        snapshot = mgr.options.decoder(fp.read())
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {snapshot.get('version')}")
+
+    restore_model(mgr, snapshot["state"])
+    mgr.unconfirmed_topics = item_topics(mgr, mgr.topic)
+
+
+def prune_unconfirmed(mgr: OZWManager) -> List[str]:
+    """Remove restored objects that no message was received for after loading.
+
+    Messages for descendants of an object confirm it as well. Removed events
+    are fired. Return the topics of the removed objects, relative to the topic
+    prefix.
+    """
+    unconfirmed = mgr.unconfirmed_topics
+    mgr.unconfirmed_topics = None
+    removed: Set[str] = set()
+
+    # Parents sort before their children, which are removed with them.
+    for topic in sorted(unconfirmed or ()):
+        parts = topic.split("/")
+        if any("/".join(parts[:index]) in removed for index in range(1, len(parts))):
+            continue
+
+        mgr.process_payload(topic, EMPTY_PAYLOAD)
+        removed.add(topic)
+
+    return sorted(removed)
+
+
+def item_topics(model: ZWaveBase, root_topic: str) -> Set[str]:
+    """Return the topics of the items with data below a model.
+
+    Topics are relative to the root topic.
+    """
+    topics: Set[str] = set()
+    start = len(root_topic) + 1
+
+    for collection in model.collections.values():
+        if isinstance(collection, ZWaveBase):
+            topics |= item_topics(collection, root_topic)
+            continue
+
+        if not isinstance(collection, ItemCollection):
+            continue
+
+        for item in collection.collection.values():
+            # Items without data of their own, like OZW instances that the
+            # daemon sends no message for, or that only hold messages for their
+            # children, are never confirmed.
+            if item.data is not item.DEFAULT_VALUE:
+                topics.add(item.topic[start:])
+            topics |= item_topics(item, root_topic)
+
+        if collection.lazy_payloads:
+            held_topic = model.topic[start:]
+            if collection.topic_part is not None:
+                held_topic = f"{held_topic}/{collection.topic_part}"
+            topics.update(
+                f"{held_topic}/{item_id}" for item_id in collection.lazy_payloads
+            )
+
+    return topics
+
+
+def encode_field(obj: Any) -> Any:
+    """Encode values that JSON does not support."""
+    if isinstance(obj, LazyField):
+        return obj.value
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
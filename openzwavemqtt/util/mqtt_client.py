@@ -2,9 +2,10 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from contextlib import AsyncExitStack
-from typing import Any, Callable, Optional, Set, Union
+from typing import Any, Callable, List, Optional, Set, Tuple, Union
 
 from asyncio_mqtt import Client as AsyncioClient, MqttError
 import paho.mqtt.client as mqtt
@@ -13,10 +14,15 @@ from paho.mqtt.subscribeoptions import SubscribeOptions
 
 from openzwavemqtt import OZWManager, OZWOptions
 from openzwavemqtt.const import LOGGER
+from openzwavemqtt.dispatcher import AsyncDispatcher
+from openzwavemqtt.exceptions import PublishQueueFullError
 
 PAHO_MQTT_LOGGER = logging.getLogger("paho.mqtt.client")
 TOPIC_OPENZWAVE = "OpenZWave"
 
+DEFAULT_PUBLISH_CONCURRENCY = 8
+DEFAULT_PUBLISH_QUEUE_SIZE = 1000
+
 
 class MQTTClient:
     """Represent an MQTT client."""
@@ -25,9 +31,17 @@ class MQTTClient:
         self,
         host: str,
         port: int = 1883,
+        publish_concurrency: int = DEFAULT_PUBLISH_CONCURRENCY,
+        publish_queue_size: int = DEFAULT_PUBLISH_QUEUE_SIZE,
+        subscribe_statistics: bool = True,
         **client_options: Any,
     ) -> None:
-        """Set up client."""
+        """Set up client.
+
+        Up to publish_concurrency messages are published at the same time.
+        Messages sent while publish_queue_size messages are queued are rejected.
+        Statistics topics are not subscribed to if subscribe_statistics is False.
+        """
         self.host = host
         self.port = port
         if "client_id" not in client_options:
@@ -39,7 +53,22 @@ class MQTTClient:
         self.asyncio_client: AsyncioClient = None
         self.create_client()
         self.reconnect_interval = 1
-        self.publish_queue: asyncio.Queue = asyncio.Queue()
+        self.publish_concurrency = publish_concurrency
+        self.subscribe_statistics = subscribe_statistics
+        # Topic, serialized payload and the time the message was queued.
+        self.publish_queue: "asyncio.Queue[Tuple[str, str, float]]" = asyncio.Queue(
+            publish_queue_size
+        )
+
+        # Publish metrics
+        self.max_publish_queue_depth = 0
+        self.publish_in_flight = 0
+        self.published = 0
+        self.publish_rejected = 0
+        # Seconds from queueing a message until it was published.
+        self.last_publish_latency = 0.0
+        self.max_publish_latency = 0.0
+        self.total_publish_latency = 0.0
 
     def create_client(self) -> None:
         """Create the asyncio client."""
@@ -118,17 +147,80 @@ class MQTTClient:
 
         await self.asyncio_client.unsubscribe(topic, **params)
 
+    @property
+    def publish_queue_depth(self) -> int:
+        """Return the number of messages waiting to be published."""
+        return self.publish_queue.qsize()
+
+    @property
+    def average_publish_latency(self) -> float:
+        """Return the average seconds from queueing a message until it was published."""
+        if not self.published:
+            return 0.0
+        return self.total_publish_latency / self.published
+
     def send_message(self, topic: str, payload: Union[str, dict]) -> None:
-        """Send a message from the manager options."""
-        to_publish = (topic, json.dumps(payload))
-        self.publish_queue.put_nowait(to_publish)
+        """Send a message from the manager options.
+
+        The payload is serialized before it is queued, so errors are raised to
+        the caller. Raise PublishQueueFullError if publish_queue_size messages
+        are queued.
+        """
+        message = json.dumps(payload)
+        try:
+            self.publish_queue.put_nowait((topic, message, time.monotonic()))
+        except asyncio.QueueFull as err:
+            self.publish_rejected += 1
+            raise PublishQueueFullError(
+                f"Publish queue is full, can't send message to {topic}"
+            ) from err
+
+        self._update_max_publish_queue_depth()
+
+    async def queue_message(self, topic: str, payload: Union[str, dict]) -> None:
+        """Send a message, waiting for room in the publish queue if it is full."""
+        message = json.dumps(payload)
+        await self.publish_queue.put((topic, message, time.monotonic()))
+        self._update_max_publish_queue_depth()
+
+    def _update_max_publish_queue_depth(self) -> None:
+        """Update the maximum publish queue depth."""
+        self.max_publish_queue_depth = max(
+            self.max_publish_queue_depth, self.publish_queue.qsize()
+        )
 
     async def _handle_publish(self) -> None:
-        """Publish messages as they are put on the queue."""
+        """Publish messages as they are put on the queue.
+
+        Queued messages are drained by publish_concurrency workers, so a burst of
+        commands is not published one round trip at a time.
+        """
+        workers: List[asyncio.Task] = [
+            asyncio.create_task(self._publish_worker())
+            for _ in range(self.publish_concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _publish_worker(self) -> None:
+        """Publish messages from the queue one at a time."""
         while True:
-            to_publish: tuple = await self.publish_queue.get()
-            await self.publish(*to_publish)
-            self.publish_queue.task_done()
+            topic, message, queued_at = await self.publish_queue.get()
+            self.publish_in_flight += 1
+            try:
+                await self.publish(topic, message)
+            finally:
+                self.publish_in_flight -= 1
+                self.publish_queue.task_done()
+
+            latency = time.monotonic() - queued_at
+            self.published += 1
+            self.last_publish_latency = latency
+            self.max_publish_latency = max(self.max_publish_latency, latency)
+            self.total_publish_latency += latency
 
     async def start_client(self, manager: OZWManager) -> None:
         """Start the client with the manager."""
@@ -161,33 +253,48 @@ class MQTTClient:
             publish_task = asyncio.create_task(self._handle_publish())
             tasks.add(publish_task)
 
+            dispatcher = manager.options.dispatcher
+            if dispatcher is not None:
+                tasks.add(asyncio.create_task(dispatcher.run()))
+
             # Messages that doesn't match a filter will get logged and handled here.
             messages = await stack.enter_async_context(
                 self.asyncio_client.unfiltered_messages()
             )
 
             messages_task = asyncio.create_task(
-                handle_messages(messages, manager.receive_message)
+                handle_messages(messages, manager.receive_message, dispatcher)
             )
             tasks.add(messages_task)
 
             # Note that we subscribe *after* starting the message loggers.
             # Otherwise, we may miss retained messages.
-            topic = f"{manager.options.topic_prefix}#"
-            await self.subscribe(topic)
+            # Command topics and other instances are filtered by the broker.
+            for topic in manager.subscription_topics(self.subscribe_statistics):
+                await self.subscribe(topic)
 
             # Wait for everything to complete (or fail due to, e.g., network errors).
             await asyncio.gather(*tasks)
 
 
-async def handle_messages(messages: Any, callback: Callable[[str, str], None]) -> None:
-    """Handle messages with callback."""
+async def handle_messages(
+    messages: Any,
+    callback: Callable[[str, Union[str, bytes]], None],
+    dispatcher: Optional[AsyncDispatcher] = None,
+) -> None:
+    """Handle messages with callback.
+
+    The raw bytes payload is passed on, the callback decodes it.
+    With a dispatcher, wait for room in its queue before handling the next message.
+    """
     async for message in messages:
-        # Note that we assume that the message payload is an
-        # UTF8-encoded string (hence the `bytes.decode` call).
-        payload = message.payload.decode()
-        LOGGER.debug("Received message topic: %s, payload: %s", message.topic, payload)
-        callback(message.topic, payload)
+        LOGGER.debug(
+            "Received message topic: %s, payload: %s", message.topic, message.payload
+        )
+        callback(message.topic, message.payload)
+
+        if dispatcher is not None:
+            await dispatcher.wait_for_room()
 
 
 async def run_client() -> None:
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""Benchmark OZWManager message processing on synthetic and recorded dumps."""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import openzwavemqtt
+from openzwavemqtt import base
+from openzwavemqtt.models.command_class import OZWCommandClass
+from openzwavemqtt.models.instance import OZWInstance
+from openzwavemqtt.models.node import OZWNode
+from openzwavemqtt.models.node_association import OZWNodeAssociation
+from openzwavemqtt.models.node_instance import OZWNodeInstance
+from openzwavemqtt.models.node_statistics import OZWNodeStatistics
+from openzwavemqtt.models.value import OZWValue
+from script.binary_dump import read_dump
+
+DEFAULT_NODE_COUNTS = (50, 200, 1000)
+TOPIC_PREFIX = "OpenZWave/"
+
+# Command classes (id, label, number of values) that every synthetic node has.
+# Loosely modelled after a metering switch with a lot of config parameters.
+SYNTHETIC_COMMAND_CLASSES = (
+    (37, "COMMAND_CLASS_SWITCH_BINARY", 1),
+    (50, "COMMAND_CLASS_METER", 6),
+    (112, "COMMAND_CLASS_CONFIGURATION", 20),
+    (114, "COMMAND_CLASS_MANUFACTURER_SPECIFIC", 3),
+    (115, "COMMAND_CLASS_POWERLEVEL", 8),
+    (134, "COMMAND_CLASS_VERSION", 3),
+)
+
+Message = Tuple[str, str]
+# Messages as received from MQTT.
+RawMessage = Tuple[str, bytes]
+
+# Decoders to compare, orjson is optional.
+DECODERS: Dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+
+try:
+    import orjson
+
+    DECODERS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+
+def get_args() -> argparse.Namespace:
+    """Get arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark OZWManager")
+    parser.add_argument(
+        "dumps",
+        type=str,
+        nargs="*",
+        help="Text dumps as written by script.dump_mqtt, or binary dumps.",
+    )
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        nargs="*",
+        default=list(DEFAULT_NODE_COUNTS),
+        help="Node counts of the synthetic dumps.",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Rounds per scenario, best is reported."
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Hold values as payload until they are accessed (lazy_values).",
+    )
+    parser.add_argument(
+        "--construct",
+        type=int,
+        default=20000,
+        help="Objects per model in the construction benchmark.",
+    )
+    return parser.parse_args()
+
+
+def value_id_key(node_id: int, cc_id: int, index: int) -> int:
+    """Return a ValueIDKey alike identifier for a synthetic value."""
+    return (node_id << 24) | (cc_id << 14) | (1 << 12) | (index << 4) | 1
+
+
+def synthetic_node_messages(node_id: int) -> Iterator[Message]:
+    """Yield the retained messages of a single synthetic node."""
+    node_topic = f"{TOPIC_PREFIX}1/node/{node_id}/"
+    yield node_topic, json.dumps(
+        {
+            "NodeID": node_id,
+            "NodeQueryStage": "Complete",
+            "isListening": True,
+            "isFlirs": False,
+            "isBeaming": True,
+            "isRouting": True,
+            "isSecurityv1": False,
+            "isZWavePlus": True,
+            "isNIFRecieved": True,
+            "isAwake": True,
+            "isFailed": False,
+            "MetaData": {
+                "OZWInfoURL": "http://www.openzwave.com/device-database/0086:0060:0003",
+                "ProductPic": "images/aeotec/zw096.png",
+                "ProductPicBase64": "A" * 4096,
+            },
+            "Event": "nodeQueriesComplete",
+            "TimeStamp": 1579566891,
+            "NodeManufacturerName": "AEON Labs",
+            "NodeProductName": "ZW096 Smart Switch 6",
+            "NodeBasicString": "Routing Slave",
+            "NodeBasic": 4,
+            "NodeGenericString": "Binary Switch",
+            "NodeGeneric": 16,
+            "NodeSpecificString": "Binary Power Switch",
+            "NodeSpecific": 1,
+            "NodeManufacturerID": "0x0086",
+            "NodeProductType": "0x0003",
+            "NodeProductID": "0x0060",
+            "NodeBaudRate": 40000,
+            "NodeVersion": 4,
+            "NodeGroups": 2,
+            "NodeName": "",
+            "NodeLocation": "",
+            "NodeDeviceTypeString": "On/Off Power Switch",
+            "NodeDeviceType": 1792,
+            "NodeRole": 5,
+            "NodeRoleString": "Always On Slave",
+            "NodePlusType": 0,
+            "NodePlusTypeString": "Z-Wave Plus node",
+            "Neighbors": [1, 2, 3],
+        }
+    )
+    yield f"{node_topic}statistics/", json.dumps(
+        {
+            "sendCount": 57,
+            "sentFailed": 0,
+            "retries": 1,
+            "receivedPackets": 1304,
+            "receivedDupPackets": 2,
+            "receivedUnsolicited": 1208,
+            "lastSentTimeStamp": 1579566891,
+            "lastReceivedTimeStamp": 1579566891,
+            "lastRequestRTT": 26,
+            "averageRequestRTT": 29,
+            "lastResponseRTT": 38,
+            "averageResponseRTT": 37,
+            "quality": 0,
+            "extendedTXSupported": False,
+        }
+    )
+    for group in (1, 2):
+        yield f"{node_topic}association/{group}/", json.dumps(
+            {
+                "Name": f"Group {group}",
+                "Help": "",
+                "MaxAssociations": 5,
+                "Members": ["1.0"],
+                "TimeStamp": 1579566891,
+            }
+        )
+    yield f"{node_topic}instance/1/", json.dumps(
+        {"Instance": 1, "TimeStamp": 1579566891}
+    )
+    yield from synthetic_value_messages(node_id, 0)
+
+
+def synthetic_value_messages(node_id: int, generation: int) -> Iterator[Message]:
+    """Yield the command class and value messages of a synthetic node.
+
+    A generation above zero only yields value updates.
+    """
+    for cc_id, cc_label, value_count in SYNTHETIC_COMMAND_CLASSES:
+        cc_topic = f"{TOPIC_PREFIX}1/node/{node_id}/instance/1/commandclass/{cc_id}/"
+        if generation == 0:
+            yield cc_topic, json.dumps(
+                {
+                    "Instance": 1,
+                    "CommandClassId": cc_id,
+                    "CommandClass": cc_label,
+                    "CommandClassVersion": 1,
+                    "TimeStamp": 1579566891,
+                }
+            )
+        for index in range(value_count):
+            key = value_id_key(node_id, cc_id, index)
+            yield f"{cc_topic}value/{key}/", json.dumps(
+                {
+                    "Label": f"Value {index}",
+                    "Value": generation + index,
+                    "Units": "W",
+                    "ValueSet": False,
+                    "ValuePolled": False,
+                    "ChangeVerified": False,
+                    "Min": 0,
+                    "Max": 255,
+                    "Type": "Int",
+                    "Instance": 1,
+                    "CommandClass": cc_label,
+                    "Index": index,
+                    "Node": node_id,
+                    "Genre": "Config" if cc_id == 112 else "User",
+                    "Help": "",
+                    "ValueIDKey": key,
+                    "ReadOnly": False,
+                    "WriteOnly": False,
+                    "Event": "valueAdded" if generation == 0 else "valueChanged",
+                    "TimeStamp": 1579566891 + generation,
+                }
+            )
+
+
+def synthetic_dump(node_count: int) -> List[Message]:
+    """Return the retained messages of a synthetic instance."""
+    messages = [
+        (f"{TOPIC_PREFIX}1/", json.dumps({})),
+        (
+            f"{TOPIC_PREFIX}1/status/",
+            json.dumps({"Status": "driverAllNodesQueried", "homeID": 3245564287}),
+        ),
+    ]
+    for node_id in range(2, node_count + 2):
+        messages.extend(synthetic_node_messages(node_id))
+    return messages
+
+
+def synthetic_updates(node_count: int) -> List[Message]:
+    """Return value updates for every value of a synthetic instance."""
+    return [
+        msg
+        for node_id in range(2, node_count + 2)
+        for msg in synthetic_value_messages(node_id, 1)
+    ]
+
+
+def count_models(model: base.ZWaveBase) -> int:
+    """Return the number of models in the tree of model."""
+    count = 1
+    for model_or_collection in model.collections.values():
+        if isinstance(model_or_collection, base.ZWaveBase):
+            count += count_models(model_or_collection)
+        elif isinstance(model_or_collection, base.ItemCollection):
+            # Held items are counted without building them.
+            count += len(model_or_collection.lazy_payloads or ())
+            for child in model_or_collection.collection.values():
+                count += count_models(child)
+    return count
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def feed(mgr: openzwavemqtt.OZWManager, messages: List[RawMessage]) -> float:
+    """Feed messages to the manager and return elapsed seconds."""
+    receive_message = mgr.receive_message
+    start = time.perf_counter()
+    for topic, payload in messages:
+        receive_message(topic, payload)
+    return time.perf_counter() - start
+
+
+def run_scenario(name: str, source: Union[int, str], lazy: bool) -> dict:
+    """Run a single scenario. Meant to run in a fresh process."""
+    messages, updates = build_scenario(source)
+    rss_before = peak_rss_mb()
+    mgr = openzwavemqtt.OZWManager(
+        openzwavemqtt.OZWOptions(lambda *_: None, lazy_values=lazy)
+    )
+    load_time = feed(mgr, messages)
+    update_time = feed(mgr, updates) if updates else 0.0
+    return {
+        "name": name,
+        "messages": len(messages),
+        "models": count_models(mgr),
+        "load_rate": len(messages) / load_time,
+        "updates": len(updates),
+        "update_rate": len(updates) / update_time if updates else None,
+        "peak_rss": peak_rss_mb(),
+        "rss_growth": peak_rss_mb() - rss_before,
+    }
+
+
+def build_scenario(
+    source: Union[int, str]
+) -> Tuple[List[RawMessage], List[RawMessage]]:
+    """Return the messages and updates of a synthetic node count or dump file."""
+    if isinstance(source, int):
+        return encode(synthetic_dump(source)), encode(synthetic_updates(source))
+    return list(read_dump(source)), []
+
+
+def encode(messages: List[Message]) -> List[RawMessage]:
+    """Return the messages with their payload encoded like MQTT delivers them."""
+    return [(topic, payload.encode()) for topic, payload in messages]
+
+
+def run_isolated(name: str, source: Union[int, str], rounds: int, lazy: bool) -> dict:
+    """Run a scenario in fresh processes and return the best round."""
+    results = []
+    # A fresh process per round keeps the peak RSS numbers meaningful.
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for _ in range(rounds):
+            results.append(pool.apply(run_scenario, (name, source, lazy)))
+    return max(results, key=lambda result: result["load_rate"])
+
+
+def construction_cost(count: int) -> Dict[str, Tuple[float, float]]:
+    """Return the construction time in microseconds and size in bytes per model.
+
+    The size is the memory allocated by the constructor, including the topic part.
+    """
+    options = openzwavemqtt.OZWOptions(lambda *_: None)
+    mgr = openzwavemqtt.OZWManager(options)
+    instance = OZWInstance(options, mgr, "1", 1)
+    node = OZWNode(options, instance, "node/2", 2)
+    node_instance = OZWNodeInstance(options, node, "instance/1", 1)
+    command_class = OZWCommandClass(options, node_instance, "commandclass/112", 112)
+
+    parents: Dict[type, base.ZWaveBase] = {
+        OZWInstance: mgr,
+        OZWNode: instance,
+        OZWNodeStatistics: node,
+        OZWNodeAssociation: node,
+        OZWNodeInstance: node,
+        OZWCommandClass: node_instance,
+        OZWValue: command_class,
+    }
+    results = {}
+    for model_class, parent in parents.items():
+        start = time.perf_counter()
+        for item_id in range(count):
+            model_class(options, parent, str(item_id), item_id)
+        elapsed = time.perf_counter() - start
+
+        models: List[Optional[base.ZWaveBase]] = [None] * count
+        tracemalloc.start()
+        for item_id in range(count):
+            models[item_id] = model_class(options, parent, str(item_id), item_id)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del models
+
+        results[model_class.__name__] = (elapsed / count * 1e6, size / count)
+    return results
+
+
+def decoding_rates(messages: List[RawMessage]) -> Dict[str, Tuple[float, float]]:
+    """Return messages and MiB per second decoded by each available decoder."""
+    payloads = [payload for _, payload in messages if payload]
+    size = sum(len(payload) for payload in payloads) / 1024 / 1024
+    results = {}
+    for name, decoder in DECODERS.items():
+        start = time.perf_counter()
+        for payload in payloads:
+            decoder(payload)
+        elapsed = time.perf_counter() - start
+        results[name] = (len(payloads) / elapsed, size / elapsed)
+    return results
+
+
+def print_result(result: dict) -> None:
+    """Print the result of a scenario."""
+    update_rate = (
+        f"{result['update_rate']:>10,.0f}" if result["update_rate"] else f"{'-':>10}"
+    )
+    print(
+        f"{result['name']:<24} {result['messages']:>8,} {result['models']:>8,} "
+        f"{result['load_rate']:>10,.0f} {update_rate} "
+        f"{result['peak_rss']:>9.1f} {result['rss_growth']:>9.1f}"
+    )
+
+
+def main() -> None:
+    """Run main entrypoint."""
+    args = get_args()
+
+    scenarios: List[Tuple[str, Union[int, str]]] = [
+        (f"synthetic {count} nodes", count) for count in args.nodes
+    ]
+    scenarios.extend((path, path) for path in args.dumps)
+
+    print(
+        f"{'scenario':<24} {'messages':>8} {'models':>8} {'load msg/s':>10} "
+        f"{'upd. msg/s':>10} {'peak MiB':>9} {'grow MiB':>9}"
+    )
+    for name, source in scenarios:
+        print_result(run_isolated(name, source, args.rounds, args.lazy))
+
+    print()
+    print(f"{'scenario':<24} {'decoder':>8} {'msg/s':>10} {'MiB/s':>9}")
+    for name, source in scenarios:
+        messages, _ = build_scenario(source)
+        for decoder_name, (rate, size_rate) in decoding_rates(messages).items():
+            print(f"{name:<24} {decoder_name:>8} {rate:>10,.0f} {size_rate:>9.1f}")
+
+    print()
+    print(f"{'model':<24} {'construct µs':>12} {'bytes':>8}")
+    for model_name, (cost, size) in construction_cost(args.construct).items():
+        print(f"{model_name:<24} {cost:>12.2f} {size:>8,.0f}")
+
+
+if __name__ == "__main__":
+    main()
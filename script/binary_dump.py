@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Indexed binary format for dumped mqtt messages.
+
+The text format written by script.dump_mqtt has a ``topic,payload`` line per
+message. The binary format can be memory-mapped and read without parsing lines:
+
+- header: magic, version, record count, topic count and the offsets of the
+  topic table and the index.
+- payloads: the payloads of all records, each optionally zlib compressed.
+- topic table: every distinct topic once, as length and UTF-8 bytes.
+- index: per record the topic number, a flags byte, the offset and stored size
+  of the payload and the size of the uncompressed payload.
+
+Records keep the order of the text dump.
+"""
+import argparse
+import mmap
+import os
+import struct
+import zlib
+from types import TracebackType
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Type
+
+MAGIC = b"OZWD"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHxxIIQQ")
+TOPIC_LENGTH = struct.Struct("<H")
+INDEX_ENTRY = struct.Struct("<IBxxxQII")
+
+FLAG_COMPRESSED = 1
+
+# Payloads smaller than this are not worth compressing.
+DEFAULT_MIN_COMPRESS_SIZE = 256
+
+
+def get_args() -> argparse.Namespace:
+    """Get arguments."""
+    parser = argparse.ArgumentParser(description="Convert mqtt dumps")
+    parser.add_argument("source", type=str, help="Text dump to convert.")
+    parser.add_argument("target", type=str, help="Binary dump to write.")
+    parser.add_argument(
+        "--compress", action="store_true", help="Compress large payloads with zlib."
+    )
+    return parser.parse_args()
+
+
+class DumpWriter:
+    """Write messages to a binary dump."""
+
+    def __init__(
+        self,
+        file_path: str,
+        compress: bool = False,
+        min_compress_size: int = DEFAULT_MIN_COMPRESS_SIZE,
+    ):
+        """Initialize the writer."""
+        self.file_path = file_path
+        self.fp: BinaryIO = open(file_path, "wb")  # pylint: disable=consider-using-with
+        self.compress = compress
+        self.min_compress_size = min_compress_size
+        self.topics: Dict[str, int] = {}
+        self.index: List[Tuple[int, int, int, int, int]] = []
+        self.fp.write(bytes(HEADER.size))
+
+    def add(self, topic: str, payload: bytes) -> None:
+        """Add a message."""
+        topic_id = self.topics.setdefault(topic, len(self.topics))
+        flags = 0
+        stored = payload
+
+        if self.compress and len(payload) >= self.min_compress_size:
+            compressed = zlib.compress(payload)
+            if len(compressed) < len(payload):
+                stored = compressed
+                flags |= FLAG_COMPRESSED
+
+        self.index.append((topic_id, flags, self.fp.tell(), len(stored), len(payload)))
+        self.fp.write(stored)
+
+    def close(self) -> None:
+        """Write the topic table, the index and the header and close the file."""
+        topic_table_offset = self.fp.tell()
+        for topic in self.topics:
+            encoded = topic.encode()
+            self.fp.write(TOPIC_LENGTH.pack(len(encoded)))
+            self.fp.write(encoded)
+
+        index_offset = self.fp.tell()
+        for entry in self.index:
+            self.fp.write(INDEX_ENTRY.pack(*entry))
+
+        self.fp.seek(0)
+        self.fp.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(self.index),
+                len(self.topics),
+                topic_table_offset,
+                index_offset,
+            )
+        )
+        self.fp.close()
+
+    def abort(self) -> None:
+        """Close and remove the file without writing the header."""
+        self.fp.close()
+        os.remove(self.file_path)
+
+    def __enter__(self) -> "DumpWriter":
+        """Enter the context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the writer, or remove a partial file if an exception was raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DumpReader:
+    """Read messages from a memory-mapped binary dump."""
+
+    def __init__(self, file_path: str):
+        """Initialize the reader."""
+        with open(file_path, "rb") as fp:
+            if os.fstat(fp.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{file_path} is not a binary dump")
+            self.mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            version,
+            record_count,
+            topic_count,
+            topic_table_offset,
+            index_offset,
+        ) = HEADER.unpack_from(self.mmap)
+
+        if magic != MAGIC or version != VERSION:
+            self.mmap.close()
+            raise ValueError(f"{file_path} is not a binary dump of version {VERSION}")
+
+        if (
+            not HEADER.size <= topic_table_offset <= index_offset
+            or index_offset + record_count * INDEX_ENTRY.size != len(self.mmap)
+        ):
+            self.mmap.close()
+            raise ValueError(f"{file_path} is truncated or corrupt")
+
+        self.record_count: int = record_count
+        self.topics: List[str] = []
+        offset = topic_table_offset
+        for _ in range(topic_count):
+            (length,) = TOPIC_LENGTH.unpack_from(self.mmap, offset)
+            offset += TOPIC_LENGTH.size
+            self.topics.append(self.mmap[offset : offset + length].decode())
+            offset += length
+
+        self.index = memoryview(self.mmap)[
+            index_offset : index_offset + self.record_count * INDEX_ENTRY.size
+        ]
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return self.record_count
+
+    def __getitem__(self, record: int) -> Tuple[str, bytes]:
+        """Return the topic and payload of a record."""
+        if not 0 <= record < self.record_count:
+            raise IndexError(record)
+
+        return self._message(
+            INDEX_ENTRY.unpack_from(self.index, record * INDEX_ENTRY.size)
+        )
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        """Iterate over the topics and payloads of all records."""
+        data = self.mmap
+        topics = self.topics
+        decompress = zlib.decompress
+
+        for topic_id, flags, offset, stored_size, _ in INDEX_ENTRY.iter_unpack(
+            self.index
+        ):
+            payload = data[offset : offset + stored_size]
+            if flags & FLAG_COMPRESSED:
+                payload = decompress(payload)
+            yield topics[topic_id], payload
+
+    def _message(self, entry: Tuple[int, int, int, int, int]) -> Tuple[str, bytes]:
+        """Return the topic and payload of an index entry."""
+        topic_id, flags, offset, stored_size, _ = entry
+        payload = self.mmap[offset : offset + stored_size]
+
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+
+        return self.topics[topic_id], payload
+
+    def close(self) -> None:
+        """Close the memory map."""
+        self.index.release()
+        self.mmap.close()
+
+
+def is_binary_dump(file_path: str) -> bool:
+    """Return if a file is a binary dump."""
+    with open(file_path, "rb") as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+def read_text_dump(file_path: str) -> Iterator[Tuple[str, bytes]]:
+    """Iterate over the topics and payloads of a text dump."""
+    with open(file_path, "rb") as fp:
+        for line in fp:
+            topic, payload = line.strip().split(b",", 1)
+            yield topic.decode(), payload
+
+
+def read_dump(file_path: str) -> Iterator[Tuple[str, bytes]]:
+    """Iterate over the topics and payloads of a text or binary dump."""
+    if not is_binary_dump(file_path):
+        yield from read_text_dump(file_path)
+        return
+
+    reader = DumpReader(file_path)
+    try:
+        yield from reader
+    finally:
+        reader.close()
+
+
+def convert(source: str, target: str, compress: bool = False) -> int:
+    """Convert a text dump to a binary dump. Return the number of records."""
+    with DumpWriter(target, compress) as writer:
+        for topic, payload in read_text_dump(source):
+            writer.add(topic, payload)
+        return len(writer.index)
+
+
+def main() -> None:
+    """Run main entrypoint."""
+    args = get_args()
+    count = convert(args.source, args.target, args.compress)
+    print(f"Converted {count} messages to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 """Create an instance from a file with dumped mqtt messages."""
 import argparse
+import os
 import re
-from typing import Optional, Set, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Set, Tuple
 
 import openzwavemqtt
 from openzwavemqtt import base
+from openzwavemqtt.const import EMPTY_PAYLOAD
+from openzwavemqtt.options import Decoder
+from script.binary_dump import read_dump
+
+# Messages per batch that a worker decodes.
+DEFAULT_BATCH_SIZE = 2000
 
 
 class ExitException(Exception):
@@ -15,21 +25,91 @@ class ExitException(Exception):
 def get_args() -> argparse.Namespace:
     """Get arguments."""
     parser = argparse.ArgumentParser(description="Dump Instance")
-    parser.add_argument("filename", type=str, help="File with messages to process.")
+    parser.add_argument(
+        "filename",
+        type=str,
+        help="File with messages to process, as text or binary dump.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes that decode JSON. More than one uses the parallel loader.",
+    )
     return parser.parse_args()
 
 
 def load_mgr_from_file(mgr: openzwavemqtt.OZWManager, file_path: str) -> None:
     """Load manager from file."""
-    with open(file_path, "rt", encoding="utf-8") as fp:
-        for line in fp:
-            topic, payload = line.strip().split(",", 1)
-            try:
-                mgr.receive_message(topic, payload)
-            except ValueError as err:
-                raise ExitException(
-                    f"Unable to process message on topic {topic} as JSON: {payload}"
-                ) from err
+    for topic, payload in read_dump(file_path):
+        try:
+            mgr.receive_message(topic, payload)
+        except ValueError as err:
+            raise ExitException(
+                f"Unable to process message on topic {topic} as JSON: {payload!r}"
+            ) from err
+
+
+def decode_batch(
+    decoder: Decoder, batch: List[Tuple[str, bytes]]
+) -> List[Tuple[str, Any]]:
+    """Decode a batch of messages. Empty payloads are returned as None."""
+    decoded = []
+    for topic, payload in batch:
+        try:
+            decoded.append((topic, decoder(payload) if payload else None))
+        except ValueError as err:
+            raise ExitException(
+                f"Unable to process message on topic {topic} as JSON: {payload!r}"
+            ) from err
+    return decoded
+
+
+def batched(
+    messages: Iterable[Tuple[str, bytes]], batch_size: int
+) -> Iterator[List[Tuple[str, bytes]]]:
+    """Split messages into consecutive batches."""
+    messages = iter(messages)
+    while True:
+        batch = list(islice(messages, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_mgr_from_file_parallel(
+    mgr: openzwavemqtt.OZWManager,
+    file_path: str,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """Load manager from file, decoding JSON in a pool of worker processes.
+
+    Only decoding is parallel. Parents have to be processed before their
+    children, so decoded batches are applied to the manager in the order of the
+    file. The result is the same as that of load_mgr_from_file. The decoder of
+    the manager options has to be picklable.
+    """
+    decoder = mgr.options.decoder
+    receive_payload = mgr.receive_payload
+    workers = workers or os.cpu_count() or 1
+    pending: Deque["Future[List[Tuple[str, Any]]]"] = deque()
+
+    def apply_oldest() -> None:
+        """Apply the oldest pending batch to the manager."""
+        for topic, payload in pending.popleft().result():
+            receive_payload(topic, EMPTY_PAYLOAD if payload is None else payload)
+
+    with ProcessPoolExecutor(workers) as pool:
+        for batch in batched(read_dump(file_path), batch_size):
+            pending.append(pool.submit(decode_batch, decoder, batch))
+
+            # Bound the batches in flight, so the file is streamed.
+            if len(pending) >= 2 * workers:
+                apply_oldest()
+
+        while pending:
+            apply_oldest()
 
 
 def camelcase_to_snake_case(name: str) -> str:
@@ -88,7 +168,7 @@ def verify_integrity(
             continue
 
         if isinstance(model_or_collection, base.ItemCollection):
-            for model_ in model_or_collection.collection.values():
+            for model_ in model_or_collection:
                 verify_integrity(model_, warned)
 
 
@@ -96,7 +176,10 @@ def main() -> None:
     """Run main entrypoint."""
     args = get_args()
     mgr = openzwavemqtt.OZWManager(openzwavemqtt.OZWOptions(print))
-    load_mgr_from_file(mgr, args.filename)
+    if args.workers > 1:
+        load_mgr_from_file_parallel(mgr, args.filename, args.workers)
+    else:
+        load_mgr_from_file(mgr, args.filename)
     verify_integrity(mgr)
 
 
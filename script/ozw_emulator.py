@@ -19,6 +19,8 @@ from hbmqtt.broker import Broker
 from hbmqtt.client import MQTTClient
 from hbmqtt.mqtt.constants import QOS_0
 
+from script.binary_dump import read_dump
+
 BROKER_CONFIG = {
     "listeners": {
         "default": {"max-connections": 50000, "type": "tcp"},
@@ -33,7 +35,9 @@ BROKER_CONFIG = {
 def get_args() -> argparse.Namespace:
     """Get arguments."""
     parser = argparse.ArgumentParser(description="OZW Emulator")
-    parser.add_argument("filename", type=str, help="File with dump from mqtt.")
+    parser.add_argument(
+        "filename", type=str, help="File with dump from mqtt, as text or binary dump."
+    )
     return parser.parse_args()
 
 
@@ -78,10 +82,8 @@ async def emulate(args: argparse.Namespace) -> None:
 
     # Parse data into a dict
     mqtt_data = {}
-    with open(args.filename, "rt", encoding="utf-8") as fp:
-        for line in fp:
-            item_topic, item_payload = line.strip().split(",", 1)
-            mqtt_data[item_topic] = json.loads(item_payload)
+    for item_topic, item_payload in read_dump(args.filename):
+        mqtt_data[item_topic] = json.loads(item_payload)
 
     # Run Broker
     broker = Broker(BROKER_CONFIG)
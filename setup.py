@@ -24,6 +24,7 @@ setup(
     zip_safe=False,
     extras_require={
         "mqtt-client": ["asyncio-mqtt"],
+        "orjson": ["orjson"],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
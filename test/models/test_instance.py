@@ -14,3 +14,59 @@ def test_events(mgr):
 
     assert len(events) == 1
     assert events[0] == {"event": "test-instance-event", "data": {"data": "for-event"}}
+
+
+def test_get_value_by_id_key(mgr):
+    """Test looking up values by ValueIDKey."""
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}/"
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    mgr.mock_receive_json(value_topic.format(1234), {"Value": True})
+    mgr.mock_receive_json(value_topic.format(5678), {"Value": False})
+
+    instance = mgr.get_instance(1)
+    assert instance.get_value_by_id_key(1234).value is True
+    assert instance.get_value_by_id_key(5678).value is False
+    assert instance.get_value_by_id_key(9999) is None
+
+    # Removing a value removes it from the index.
+    mgr.receive_message(value_topic.format(1234), "")
+    assert instance.get_value_by_id_key(1234) is None
+
+    # Removing the node removes all its values from the index.
+    mgr.receive_message("OpenZWave/1/node/2", "")
+    assert instance.get_value_by_id_key(5678) is None
+
+
+def test_command_topics(mgr):
+    """Test commands are sent to the topics of the instance."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    mgr.mock_receive_json(
+        "OpenZWave/1/node/2/instance/1/commandclass/37/value/1234",
+        {"ValueIDKey": 1234},
+    )
+
+    instance = mgr.get_instance(1)
+    value = instance.get_value_by_id_key(1234)
+    assert value.topic == "OpenZWave/1/node/2/instance/1/commandclass/37/value/1234"
+    assert value.ozw_instance is instance
+    assert value.node is instance.get_node(2)
+
+    instance.refresh_node(2)
+    value.send_value(True)
+    value.send_value(False)
+
+    assert mgr.options.mock_sent == [
+        ("OpenZWave/1/command/refreshnodeinfo/", {"node": 2}),
+        ("OpenZWave/1/command/setvalue/", {"ValueIDKey": 1234, "Value": True}),
+        ("OpenZWave/1/command/setvalue/", {"ValueIDKey": 1234, "Value": False}),
+    ]
+    assert instance.command_topics == {
+        "refreshnodeinfo": "OpenZWave/1/command/refreshnodeinfo/",
+        "setvalue": "OpenZWave/1/command/setvalue/",
+    }
@@ -0,0 +1,107 @@
+"""Provide tests for the node model."""
+from openzwavemqtt.const import CommandClass, ValueIndex
+
+NODE_TOPIC = "OpenZWave/1/node/2"
+CC_TOPIC = f"{NODE_TOPIC}/instance/1/commandclass/112"
+VALUE_TOPIC = f"{CC_TOPIC}/value/{{}}"
+
+
+def setup_config_node(mgr):
+    """Set up a node with two config parameters."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json(NODE_TOPIC, {"NodeID": 2})
+    mgr.mock_receive_json(f"{NODE_TOPIC}/instance/1", {"Instance": 1})
+    mgr.mock_receive_json(CC_TOPIC, {"Instance": 1, "CommandClassId": 112})
+    mgr.mock_receive_json(VALUE_TOPIC.format(1001), {"Index": 1, "Value": 10})
+    mgr.mock_receive_json(VALUE_TOPIC.format(1002), {"Index": 2, "Value": 20})
+    return mgr.get_instance(1).get_node(2)
+
+
+def test_get_value(mgr):
+    """Test looking up command classes and values."""
+    node = setup_config_node(mgr)
+
+    command_class = node.get_command_class(CommandClass.CONFIGURATION)
+    assert command_class.id == 112
+    assert node.get_instance(1).get_command_class(CommandClass.CONFIGURATION) is (
+        command_class
+    )
+    assert node.get_command_class(CommandClass.USER_CODE) is None
+
+    assert node.get_value(CommandClass.CONFIGURATION, 1).value == 10
+    assert node.get_value(CommandClass.CONFIGURATION, 2).value == 20
+    assert node.get_instance(1).get_value(CommandClass.CONFIGURATION, 2).value == 20
+    assert node.get_value(CommandClass.CONFIGURATION, 3) is None
+    assert not node.has_value(CommandClass.USER_CODE, ValueIndex.CLEAR_USER_CODE)
+
+
+def test_indexes_follow_changes(mgr):
+    """Test indexes are updated when items change or are removed."""
+    node = setup_config_node(mgr)
+    command_class = node.get_command_class(CommandClass.CONFIGURATION)
+
+    mgr.mock_receive_json(VALUE_TOPIC.format(1002), {"Index": 3, "Value": 30})
+    assert node.get_value(CommandClass.CONFIGURATION, 2) is None
+    assert node.get_value(CommandClass.CONFIGURATION, 3).value == 30
+
+    mgr.receive_message(VALUE_TOPIC.format(1001), "")
+    assert command_class.get_value_by_index(1) is None
+
+    mgr.receive_message(CC_TOPIC, "")
+    assert node.get_command_class(CommandClass.CONFIGURATION) is None
+    assert command_class.get_value_by_index(3) is None
+
+
+def test_index_command_class_without_data(mgr):
+    """Test command classes are indexed once their data arrives."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json(NODE_TOPIC, {"NodeID": 2})
+    mgr.mock_receive_json(f"{NODE_TOPIC}/instance/1", {"Instance": 1})
+
+    # The value creates the command class, which holds it until data is received.
+    mgr.mock_receive_json(VALUE_TOPIC.format(1001), {"Index": 1, "Value": 10})
+    node = mgr.get_instance(1).get_node(2)
+    assert node.get_command_class(CommandClass.CONFIGURATION) is None
+
+    mgr.mock_receive_json(CC_TOPIC, {"Instance": 1, "CommandClassId": 112})
+    assert node.get_value(CommandClass.CONFIGURATION, 1).value == 10
+
+
+def test_multiple_instances(mgr):
+    """Test command classes on multiple node instances."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json(NODE_TOPIC, {"NodeID": 2})
+    for instance in (1, 2, 3):
+        mgr.mock_receive_json(
+            f"{NODE_TOPIC}/instance/{instance}", {"Instance": instance}
+        )
+    mgr.mock_receive_json(
+        f"{NODE_TOPIC}/instance/1/commandclass/50", {"CommandClassId": 50}
+    )
+    for instance in (2, 3):
+        mgr.mock_receive_json(
+            f"{NODE_TOPIC}/instance/{instance}/commandclass/37",
+            {"CommandClassId": 37},
+        )
+    node = mgr.get_instance(1).get_node(2)
+
+    # The command class only lives on the second and third instance.
+    assert node.get_command_class(CommandClass.SWITCH_BINARY).parent.id == 2
+    assert node.get_command_class(CommandClass.SWITCH_BINARY, 3).parent.id == 3
+    assert node.get_command_class(CommandClass.SWITCH_BINARY, 1) is None
+    assert node.has_command_class(CommandClass.METER)
+
+    endpoints = node.get_command_class_endpoints(CommandClass.SWITCH_BINARY)
+    assert {instance: cc.parent.id for instance, cc in endpoints.items()} == {
+        2: 2,
+        3: 3,
+    }
+    assert node.get_command_class_endpoints(CommandClass.USER_CODE) == {}
+
+    mgr.receive_message(f"{NODE_TOPIC}/instance/2", "")
+    assert node.get_command_class(CommandClass.SWITCH_BINARY).parent.id == 3
+    assert list(node.get_command_class_endpoints(CommandClass.SWITCH_BINARY)) == [3]
+
+    mgr.receive_message(f"{NODE_TOPIC}/instance/3/commandclass/37", "")
+    assert node.get_command_class(CommandClass.SWITCH_BINARY) is None
+    assert CommandClass.SWITCH_BINARY not in node.command_class_endpoints
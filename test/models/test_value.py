@@ -1,10 +1,19 @@
 """Provide tests for the node value."""
+import logging
+
 from openzwavemqtt.const import (
+    EVENT_LAZY_VALUE_ADDED,
     EVENT_VALUE_ADDED,
     EVENT_VALUE_CHANGED,
+    EVENT_VALUE_DELTA,
     EVENT_VALUE_REMOVED,
+    CommandClass,
+    ValueGenre,
+    ValueType,
 )
 
+from ..conftest import MockManager, MockOptions
+
 
 def test_value_events(mgr):
     """Test value events."""
@@ -50,3 +59,211 @@ def test_value_events(mgr):
     mgr.receive_message("OpenZWave/1/node/2/instance/1/commandclass/4/value/3", "")
     assert len(events) == 3
     assert events[0].id == 3
+
+
+def test_cached_enums(mgr, caplog):
+    """Test enums are cached until the data changes."""
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json(
+        "OpenZWave/1/node/2/instance/1/commandclass/999", {"CommandClassId": 999}
+    )
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/999/value/3"
+    mgr.mock_receive_json(value_topic, {"Type": "Bool", "Genre": "User"})
+
+    command_class = (
+        mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(999)
+    )
+    value = command_class.get_value(3)
+    assert value.type is ValueType.BOOL
+    assert value.genre is ValueGenre.USER
+    assert value.data_cache == {"type": ValueType.BOOL, "genre": ValueGenre.USER}
+
+    mgr.mock_receive_json(value_topic, {"Type": "List", "Genre": "Invalid"})
+    assert value.data_cache is None
+    assert value.type is ValueType.LIST
+    assert value.genre is ValueGenre.UNKNOWN
+
+    # Unknown command classes are only logged once.
+    with caplog.at_level(logging.WARNING):
+        assert command_class.command_class_id is CommandClass.UNKNOWN
+        mgr.mock_receive_json(
+            "OpenZWave/1/node/2/instance/1/commandclass/999", {"CommandClassId": 999}
+        )
+        assert value.command_class is CommandClass.UNKNOWN
+    assert caplog.text.count("Unknown CommandClass found: 999") == 1
+    assert mgr.get_instance(1).unknown_command_classes == {999}
+
+    # Other managers log them again.
+    caplog.clear()
+    other = MockManager(MockOptions())
+    other.mock_receive_json("OpenZWave/1/node/2", {})
+    other.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    other.mock_receive_json(
+        "OpenZWave/1/node/2/instance/1/commandclass/999", {"CommandClassId": 999}
+    )
+    with caplog.at_level(logging.WARNING):
+        other_command_class = (
+            other.get_instance(1).get_node(2).get_instance(1).get_commandclass(999)
+        )
+        assert other_command_class.command_class_id is CommandClass.UNKNOWN
+    assert caplog.text.count("Unknown CommandClass found: 999") == 1
+
+
+def test_value_delta(mgr):
+    """Test delta events with the previous and new values of changed keys."""
+    deltas = []
+    scoped_deltas = []
+    mgr.options.listen(EVENT_VALUE_DELTA, deltas.append)
+    mgr.options.listen(EVENT_VALUE_DELTA, scoped_deltas.append, value_id_key=4)
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/37/value/3"
+
+    mgr.mock_receive_json(value_topic, {"Value": False, "ValueSet": False})
+    mgr.mock_receive_json(value_topic, {"Value": False, "ValueSet": False})
+    assert not deltas
+
+    mgr.mock_receive_json(value_topic, {"Value": True, "Label": "Switch"})
+    (delta,) = deltas
+    assert delta.model.value is True
+    assert delta.changes == {
+        "Value": (False, True),
+        "ValueSet": (False, None),
+        "Label": (None, "Switch"),
+    }
+    assert not scoped_deltas
+
+
+def test_lazy_values(mgr):
+    """Test values are held as payload until they are accessed."""
+    mgr.options.lazy_values = True
+    lazy_added = []
+    mgr.options.listen(EVENT_LAZY_VALUE_ADDED, lazy_added.append)
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}"
+
+    for value_id in (3, 4, 5):
+        mgr.mock_receive_json(
+            value_topic.format(value_id), {"Index": value_id, "Value": False}
+        )
+    mgr.mock_receive_json(value_topic.format(3), {"Index": 3, "Value": True})
+
+    ozw_instance = mgr.get_instance(1)
+    command_class = ozw_instance.get_node(2).get_instance(1).get_commandclass(37)
+    values = command_class.collections["value"]
+    assert not values.collection
+    assert [item.id for item in lazy_added] == [3, 4, 5]
+    # The payload is the latest one.
+    assert lazy_added[0].data["Value"] is True
+    assert lazy_added[1].listener_scope.value_id_key == 4
+
+    # Values are built on access, without added events.
+    added = []
+    mgr.options.listen(EVENT_VALUE_ADDED, added.append)
+    assert ozw_instance.get_value_by_id_key(3).value is True
+    assert list(values.collection) == [3]
+    assert lazy_added[1].item is command_class.get_value(4)
+    assert not added
+
+    # Removed values are forgotten.
+    mgr.receive_message(value_topic.format(5), "")
+    assert command_class.get_value(5) is None
+    assert not ozw_instance.lazy_values
+
+    # Values with listeners are built right away.
+    changed = []
+    mgr.options.listen(EVENT_VALUE_CHANGED, changed.append)
+    mgr.mock_receive_json(value_topic.format(6), {"Index": 6, "Value": False})
+    assert [value.id for value in added] == [6]
+    assert command_class.get_value_by_index(6).value is False
+
+
+def test_lazy_values_after_removed_listener(mgr):
+    """Test values are held again once listeners are removed."""
+    mgr.options.lazy_values = True
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}"
+    command_class = mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(37)
+    values = command_class.collections["value"]
+
+    remove_added = mgr.options.listen(EVENT_VALUE_ADDED, print)
+    remove_changed = mgr.options.listen(EVENT_VALUE_CHANGED, print, node_id=2)
+    mgr.mock_receive_json(value_topic.format(3), {"Index": 3})
+    assert list(values.collection) == [3]
+
+    remove_added()
+    remove_changed()
+    mgr.mock_receive_json(value_topic.format(4), {"Index": 4})
+    assert list(values.collection) == [3]
+    assert list(values.lazy_payloads) == [4]
+
+
+def test_lazy_values_scoped_listeners(mgr):
+    """Test scoped listeners only build the values that they match."""
+    mgr.options.lazy_values = True
+    changed = []
+    removed = []
+    mgr.options.listen(EVENT_VALUE_CHANGED, changed.append, value_id_key=3)
+    mgr.options.listen(EVENT_VALUE_REMOVED, removed.append, value_id_key=4)
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}"
+    command_class = mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(37)
+    values = command_class.collections["value"]
+
+    for value_id in (3, 4, 5):
+        mgr.mock_receive_json(value_topic.format(value_id), {"Index": value_id})
+    for value_id in (3, 4, 5):
+        mgr.mock_receive_json(
+            value_topic.format(value_id), {"Index": value_id, "Value": True}
+        )
+
+    assert list(values.collection) == [3]
+    assert sorted(values.lazy_payloads) == [4, 5]
+    assert [value.id for value in changed] == [3]
+
+    # Removing the command class only builds the values with removed listeners.
+    mgr.receive_message("OpenZWave/1/node/2/instance/1/commandclass/37", "")
+    assert [value.id for value in removed] == [4]
+    assert not mgr.get_instance(1).lazy_values
+
+
+def test_lazy_values_by_index(mgr):
+    """Test held values are found by Index without building the others."""
+    mgr.options.lazy_values = True
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+    value_topic = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}"
+    command_class = mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(37)
+    values = command_class.collections["value"]
+
+    for value_id in (3, 4, 5):
+        mgr.mock_receive_json(value_topic.format(value_id), {"Index": value_id * 10})
+    assert command_class.lazy_values_by_index == {30: 3, 40: 4, 50: 5}
+
+    assert command_class.get_value_by_index(40).id == 4
+    assert list(values.collection) == [4]
+    assert command_class.lazy_values_by_index == {30: 3, 50: 5}
+    assert command_class.get_value_by_index(60) is None
+    assert list(values.collection) == [4]
+
+    # The Index of held values is kept up to date.
+    mgr.mock_receive_json(value_topic.format(5), {"Index": 60})
+    assert command_class.lazy_values_by_index == {30: 3, 60: 5}
+    mgr.receive_message(value_topic.format(3), "")
+    assert command_class.lazy_values_by_index == {60: 5}
+    assert command_class.has_value(60)
+    assert not command_class.lazy_values_by_index
+    assert sorted(values.collection) == [4, 5]
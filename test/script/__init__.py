@@ -0,0 +1 @@
+"""Tests for script module."""
@@ -0,0 +1,83 @@
+"""Tests for binary_dump script."""
+import json
+
+import pytest
+
+from script.binary_dump import (
+    DumpReader,
+    DumpWriter,
+    convert,
+    is_binary_dump,
+    read_dump,
+    read_text_dump,
+)
+
+MESSAGES = [
+    ("OpenZWave/1/", {"Status": "driverAllNodesQueried"}),
+    ("OpenZWave/1/node/2/", {"NodeID": 2, "MetaData": {"Pic": "A" * 1000}}),
+    ("OpenZWave/1/node/2/statistics/", {"sendCount": 3}),
+    ("OpenZWave/1/node/2/", {"NodeID": 2, "Name": "Switch"}),
+    ("OpenZWave/1/node/3/", None),
+]
+
+
+@pytest.fixture(name="text_dump")
+def text_dump_fixture(tmp_path):
+    """Write a text dump."""
+    file_path = tmp_path / "dump.csv"
+    with open(file_path, "w") as fp:
+        for topic, payload in MESSAGES:
+            fp.write(f"{topic},{'' if payload is None else json.dumps(payload)}\n")
+    return str(file_path)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(text_dump, tmp_path, compress):
+    """Test messages read back from a binary dump match the text dump."""
+    binary_dump = str(tmp_path / "dump.ozwd")
+    assert convert(text_dump, binary_dump, compress) == len(MESSAGES)
+    assert is_binary_dump(binary_dump)
+    assert not is_binary_dump(text_dump)
+
+    messages = list(read_text_dump(text_dump))
+    assert [topic for topic, _ in messages] == [topic for topic, _ in MESSAGES]
+    assert list(read_dump(binary_dump)) == messages
+    assert list(read_dump(text_dump)) == messages
+
+    reader = DumpReader(binary_dump)
+    assert len(reader) == len(MESSAGES)
+    assert len(reader.topics) == 4
+    assert reader[1] == messages[1]
+    assert reader[4] == ("OpenZWave/1/node/3/", b"")
+    with pytest.raises(IndexError):
+        reader[5]  # pylint: disable=pointless-statement
+    reader.close()
+
+    # Only the large payload is compressed.
+    with open(binary_dump, "rb") as fp:
+        size = len(fp.read())
+    assert (size < 1000) is compress
+
+
+def test_truncated(text_dump, tmp_path):
+    """Test truncated and corrupt dumps are rejected."""
+    binary_dump = tmp_path / "dump.ozwd"
+    convert(text_dump, str(binary_dump), True)
+    data = binary_dump.read_bytes()
+
+    for corrupt in (data[:-1], data[:100], data[:10], b"XXXX" + data[4:]):
+        binary_dump.write_bytes(corrupt)
+        with pytest.raises(ValueError):
+            DumpReader(str(binary_dump))
+
+
+def test_writer_exception(tmp_path):
+    """Test an exception while writing leaves no dump behind."""
+    binary_dump = tmp_path / "dump.ozwd"
+
+    with pytest.raises(RuntimeError):
+        with DumpWriter(str(binary_dump)) as writer:
+            writer.add("OpenZWave/1/", b"{}")
+            raise RuntimeError
+
+    assert not binary_dump.exists()
@@ -0,0 +1,68 @@
+"""Tests for instance_from_file script."""
+import json
+
+import pytest
+
+from openzwavemqtt.snapshot import snapshot_model
+from script.binary_dump import convert
+from script.instance_from_file import (
+    ExitException,
+    batched,
+    load_mgr_from_file,
+    load_mgr_from_file_parallel,
+)
+
+from ..conftest import MockManager, MockOptions
+
+CC_TOPIC = "OpenZWave/1/node/{}/instance/1/commandclass/37"
+
+
+def write_dump(file_path):
+    """Write a text dump with nodes, values and removals."""
+    with open(file_path, "w") as fp:
+        fp.write(f"OpenZWave/1/,{json.dumps({'Status': 'driverReady'})}\n")
+        for node_id in range(2, 12):
+            # Children before their parent are held until it is received.
+            fp.write(f"{CC_TOPIC.format(node_id)}/,{json.dumps({'Instance': 1})}\n")
+            fp.write(f"OpenZWave/1/node/{node_id}/,{json.dumps({'NodeID': node_id})}\n")
+            fp.write(f"OpenZWave/1/node/{node_id}/instance/1/,{{}}\n")
+            for index in range(5):
+                value_id = node_id * 10 + index
+                value = {"Index": index, "Value": index, "ValueIDKey": value_id}
+                topic = f"{CC_TOPIC.format(node_id)}/value/{value_id}/"
+                fp.write(f"{topic},{json.dumps(value)}\n")
+        fp.write("OpenZWave/1/node/5/,\n")
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_parallel_loader(tmp_path, binary):
+    """Test the parallel loader builds the same tree as the sequential one."""
+    file_path = str(tmp_path / "dump.csv")
+    write_dump(file_path)
+    if binary:
+        convert(file_path, str(tmp_path / "dump.ozwd"))
+        file_path = str(tmp_path / "dump.ozwd")
+
+    sequential = MockManager(MockOptions())
+    load_mgr_from_file(sequential, file_path)
+    parallel = MockManager(MockOptions())
+    load_mgr_from_file_parallel(parallel, file_path, workers=2, batch_size=7)
+
+    state = snapshot_model(sequential)
+    assert snapshot_model(parallel) == state
+    nodes = state["children"]["instance"]["1"]["children"]["node"]
+    assert set(nodes) == {str(node_id) for node_id in range(2, 12) if node_id != 5}
+
+
+def test_parallel_loader_invalid_json(tmp_path):
+    """Test invalid JSON stops the parallel loader."""
+    file_path = tmp_path / "dump.csv"
+    file_path.write_text("OpenZWave/1/,{}\nOpenZWave/1/node/2/,{invalid\n")
+
+    with pytest.raises(ExitException):
+        load_mgr_from_file_parallel(MockManager(MockOptions()), str(file_path))
+
+
+def test_batched():
+    """Test messages are split into consecutive batches."""
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
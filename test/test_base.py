@@ -5,6 +5,7 @@ from unittest.mock import patch
 import pytest
 
 from openzwavemqtt import base
+from openzwavemqtt.models.node import OZWNode
 
 
 class Level3(base.ZWaveBase):
@@ -222,3 +223,107 @@ def test_repr():
 
     inst = TestNode(None, None, "mock-topic-part", "mock-id")
     assert str(inst) == "<TestNode mock-id>"
+
+
+def test_slots(mgr, options):
+    """Test models have no instance dict and accessors live on the class."""
+    node = OZWNode(options, None, "node/2", 2)
+
+    assert not hasattr(node, "__dict__")
+    assert isinstance(OZWNode.__dict__["get_instance"], base.CollectionAccessor)
+    assert isinstance(OZWNode.__dict__["instances"], base.CollectionAccessor)
+    assert node.get_statistics() is node.collections["statistics"]
+    assert list(node.instances()) == []
+    assert mgr.get_instance(1) is None
+
+
+def test_accessor_conflict(options):
+    """Test accessors do not replace existing attributes."""
+
+    class Level2Conflict(base.ZWaveBase):
+        """Represent a level 2 descendant with a conflicting attribute."""
+
+        EVENT_CHANGED = "level2_change"
+
+        def level3s(self):
+            """Return something else."""
+
+        def create_collections(self):
+            """Create collections."""
+            return {"level3": base.ItemCollection(Level3)}
+
+    with pytest.raises(RuntimeError):
+        Level2Conflict(options, None, None, None)
+
+
+def test_collection_schema(options):
+    """Test collections are created from a schema compiled once per class."""
+    calls = []
+
+    def create_collections(model):
+        calls.append(model)
+        return {
+            "level3": base.ItemCollection(Level3),
+            "command": base.DiscardMessages(),
+            "event": base.EventMessages(model.options, "event", lambda *_: "type"),
+        }
+
+    with patch.object(Level2, "create_collections", create_collections):
+        first = Level2(options, None, None, 1)
+        second = Level2(None, None, None, 2)
+
+    assert calls == [first]
+    assert first.collections["level3"] is not second.collections["level3"]
+    assert second.collections["level3"].parent is second
+    assert second.collections["event"].options is None
+    assert first.collections["command"] is second.collections["command"]
+
+    # Leaf models share the empty collections.
+    assert Level3(options, None, None, 1).collections is base.NO_COLLECTIONS
+
+    # The schema is compiled again for the original collections.
+    assert list(Level2(options, None, None, 3).collections) == ["level3"]
+
+
+def test_change_detection(level1, options):
+    """Test changed events are only fired for changed data."""
+    events = []
+    keys = []
+
+    def listener(model):
+        """Record the model and its changed keys."""
+        events.append(model)
+        keys.append(model.changed_keys)
+
+    remove = options.listen("level2_change", listener)
+    level1.process_message(deque(), {"info": 1})
+    level1.process_message(deque(["2"]), {"info": 1, "TimeStamp": 1})
+    level2 = level1.get_level2(2)
+
+    level1.process_message(deque(["2"]), {"info": 1, "TimeStamp": 1})
+    assert not events
+
+    level1.process_message(deque(["2"]), {"info": 2, "TimeStamp": 2, "new": 1})
+    assert events == [level2]
+    assert keys == [{"info", "TimeStamp", "new"}]
+    # Keys are reset once the event is delivered.
+    assert not level2.changed_keys
+
+    level1.process_message(deque(["2"]), {"info": 2, "TimeStamp": 2})
+    assert keys[-1] == {"new"}
+
+    # Volatile keys are updated, but do not count as a change.
+    options.volatile_keys = frozenset(["TimeStamp"])
+    level1.process_message(deque(["2"]), {"info": 2, "TimeStamp": 3})
+    assert len(events) == 2
+    assert level2.data["TimeStamp"] == 3
+
+    options.suppress_unchanged = False
+    level1.process_message(deque(["2"]), {"info": 2, "TimeStamp": 3})
+    assert len(events) == 3
+    assert not keys[-1]
+
+    # Keys are not kept without listeners.
+    remove()
+    level1.process_message(deque(["2"]), {"info": 3, "TimeStamp": 3})
+    assert not level2.changed_keys
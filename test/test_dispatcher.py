@@ -0,0 +1,143 @@
+"""Provide tests for the async dispatcher."""
+import asyncio
+
+import pytest
+
+from openzwavemqtt.const import (
+    EVENT_VALUE_ADDED,
+    EVENT_VALUE_CHANGED,
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+)
+from openzwavemqtt.dispatcher import AsyncDispatcher
+
+VALUE_TOPIC = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}"
+
+
+def setup_command_class(mgr):
+    """Set up a node with a command class."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/commandclass/37", {})
+
+
+async def drain(dispatcher):
+    """Run the dispatcher until the queue is empty."""
+    task = asyncio.create_task(dispatcher.run())
+    while dispatcher.queue_depth:
+        await asyncio.sleep(0)
+    # Let the last event finish.
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+
+def test_dispatch(mgr, options):
+    """Test listeners are called from the dispatcher, including coroutines."""
+    options.dispatcher = AsyncDispatcher()
+    events = []
+
+    async def async_listener(value):
+        await asyncio.sleep(0)
+        events.append(("async", value.value))
+
+    def failing_listener(value):
+        raise ValueError
+
+    options.listen(EVENT_VALUE_CHANGED, lambda value: events.append(("sync", value)))
+    options.listen(EVENT_VALUE_CHANGED, failing_listener)
+    options.listen(EVENT_VALUE_ADDED, async_listener)
+    setup_command_class(mgr)
+
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 1})
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 2})
+
+    # Nothing is called while processing messages.
+    assert not events
+    assert options.dispatcher.queue_depth == 2
+
+    asyncio.run(drain(options.dispatcher))
+
+    command_class = mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(37)
+    assert events == [("async", 2), ("sync", command_class.get_value(1))]
+    assert options.dispatcher.max_queue_depth == 2
+
+
+def test_drop_oldest(mgr, options):
+    """Test the oldest events are dropped when the queue is full."""
+    options.dispatcher = AsyncDispatcher(maxsize=2, overflow=OVERFLOW_DROP_OLDEST)
+    events = []
+    options.listen(EVENT_VALUE_ADDED, lambda value: events.append(value.id))
+    setup_command_class(mgr)
+
+    for value_id in (1, 2, 3):
+        mgr.mock_receive_json(VALUE_TOPIC.format(value_id), {})
+
+    assert options.dispatcher.queue_depth == 2
+    assert options.dispatcher.dropped == 1
+
+    asyncio.run(drain(options.dispatcher))
+    assert events == [2, 3]
+
+
+def test_coalesce(mgr, options):
+    """Test queued events for the same object are coalesced."""
+    options.dispatcher = AsyncDispatcher(overflow=OVERFLOW_COALESCE)
+    events = []
+    options.listen(EVENT_VALUE_CHANGED, lambda value: events.append(value.value))
+    setup_command_class(mgr)
+
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 0})
+    for state in (1, 2, 3):
+        mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": state})
+
+    assert options.dispatcher.queue_depth == 1
+    assert options.dispatcher.coalesced == 2
+
+    asyncio.run(drain(options.dispatcher))
+    assert events == [3]
+
+
+def test_changed_keys(mgr, options):
+    """Test dispatched changed events hold the keys of all queued messages."""
+    options.dispatcher = AsyncDispatcher(overflow=OVERFLOW_COALESCE)
+    keys = []
+    options.listen(EVENT_VALUE_CHANGED, lambda value: keys.append(value.changed_keys))
+    setup_command_class(mgr)
+
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 1})
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 2})
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 2, "Label": "Switch"})
+    asyncio.run(drain(options.dispatcher))
+    assert keys == [{"Value", "Label"}]
+
+    mgr.mock_receive_json(VALUE_TOPIC.format(1), {"Value": 3, "Label": "Switch"})
+    asyncio.run(drain(options.dispatcher))
+    assert keys[-1] == {"Value"}
+
+
+def test_wait_for_room(options):
+    """Test ingestion waits until the queue has room."""
+    dispatcher = AsyncDispatcher(maxsize=1)
+    options.dispatcher = dispatcher
+    events = []
+    options.listen(EVENT_VALUE_ADDED, events.append)
+
+    async def ingest():
+        options.notify(EVENT_VALUE_ADDED, {"id": 1})
+        waiter = asyncio.create_task(dispatcher.wait_for_room())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        task = asyncio.create_task(dispatcher.run())
+        await asyncio.wait_for(waiter, 1)
+        task.cancel()
+
+    asyncio.run(ingest())
+    assert events == [{"id": 1}]
+
+
+def test_unknown_policy():
+    """Test an unknown overflow policy is rejected."""
+    with pytest.raises(ValueError):
+        AsyncDispatcher(overflow="unknown")
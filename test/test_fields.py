@@ -0,0 +1,91 @@
+"""Provide tests for heavy payload fields."""
+import base64
+import json
+
+from openzwavemqtt.const import FIELD_PRODUCT_PIC, HEAVY_FIELD_LAZY, HEAVY_FIELD_STRIP
+from openzwavemqtt.fields import LazyField, decode_without_heavy_fields
+
+PICTURE = base64.b64encode(bytes(range(256)) * 4).decode()
+
+
+def receive_node(mgr, meta_data):
+    """Receive a node with meta data and return it."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {"NodeID": 2, "MetaData": meta_data})
+    return mgr.get_instance(1).get_node(2)
+
+
+def test_no_heavy_fields(mgr):
+    """Test fields are kept by default."""
+    node = receive_node(mgr, {"ProductPicBase64": PICTURE})
+    assert node.meta_data["ProductPicBase64"] == PICTURE
+
+
+def test_strip(mgr, options):
+    """Test stripping heavy fields."""
+    options.heavy_fields = (FIELD_PRODUCT_PIC, ("Missing", "Field"))
+    node = receive_node(mgr, {"ProductPicBase64": PICTURE, "Name": "Switch"})
+    assert node.meta_data == {"ProductPicBase64": "", "Name": "Switch"}
+
+
+def test_lazy(mgr, options):
+    """Test lazily holding heavy fields."""
+    options.heavy_fields = (FIELD_PRODUCT_PIC,)
+    options.heavy_field_mode = HEAVY_FIELD_LAZY
+    node = receive_node(mgr, {"ProductPicBase64": PICTURE})
+
+    field = node.meta_data["ProductPicBase64"]
+    assert isinstance(field, LazyField)
+    assert len(field.raw) == 1024
+    assert field.value == PICTURE
+    assert field == LazyField(bytes(range(256)) * 4)
+
+    # Values that are not valid base64 are kept.
+    node = receive_node(mgr, {"ProductPicBase64": "not base64!"})
+    assert node.meta_data["ProductPicBase64"] == "not base64!"
+
+
+def test_decode_without_heavy_fields():
+    """Test heavy fields are cut out of messages before decoding."""
+    messages = []
+
+    def decoder(message):
+        """Record and decode a message."""
+        messages.append(message)
+        return json.loads(message)
+
+    meta_data = {"ProductPicBase64": PICTURE, "Name": "Switch"}
+    message = json.dumps({"NodeID": 2, "MetaData": meta_data}, indent=4)
+
+    for raw in (message, message.encode()):
+        messages.clear()
+        payload = decode_without_heavy_fields(
+            decoder, raw, (FIELD_PRODUCT_PIC,), HEAVY_FIELD_LAZY
+        )
+        assert payload["MetaData"]["ProductPicBase64"].value == PICTURE
+        assert payload["MetaData"]["Name"] == "Switch"
+        assert len(messages) == 1
+        assert len(messages[0]) < 200
+
+    payload = decode_without_heavy_fields(
+        decoder, message, (FIELD_PRODUCT_PIC,), HEAVY_FIELD_STRIP
+    )
+    assert payload["MetaData"] == {"ProductPicBase64": "", "Name": "Switch"}
+
+    # Keys outside of the path are decoded as they are.
+    messages.clear()
+    message = json.dumps({"ProductPicBase64": "x", "MetaData": {}})
+    payload = decode_without_heavy_fields(
+        decoder, message, (FIELD_PRODUCT_PIC,), HEAVY_FIELD_STRIP
+    )
+    assert payload == {"ProductPicBase64": "x", "MetaData": {}}
+    assert len(messages) == 2
+
+    # Values with escapes are not cut.
+    messages.clear()
+    message = json.dumps({"MetaData": {"ProductPicBase64": "a\\/b"}})
+    payload = decode_without_heavy_fields(
+        decoder, message, (FIELD_PRODUCT_PIC,), HEAVY_FIELD_STRIP
+    )
+    assert messages == [message]
+    assert payload == {"MetaData": {"ProductPicBase64": "a\\/b"}}
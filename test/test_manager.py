@@ -1,4 +1,5 @@
 """Provide tests for the manager."""
+import json
 
 
 def test_receive_message(mgr):
@@ -28,3 +29,52 @@ def test_receive_message(mgr):
     mgr.receive_message("OpenZWave/1/node/2/value/3/", '{"mock":"payload"}')
 
     assert messages == 2
+
+
+def test_receive_bytes(mgr, options):
+    """Test bytes payloads and custom decoders."""
+    decoded = []
+
+    def decoder(message):
+        decoded.append(message)
+        return json.loads(message)
+
+    options.decoder = decoder
+    mgr.receive_message("OpenZWave/1/", b"{}")
+    mgr.receive_message("OpenZWave/1/node/2/", b'{"NodeID": 2}')
+    assert decoded == [b"{}", b'{"NodeID": 2}']
+    assert mgr.get_instance(1).get_node(2).node_id == 2
+
+    # Payloads that are already decoded skip the decoder.
+    mgr.receive_payload("OpenZWave/1/node/3/", {"NodeID": 3})
+    assert mgr.get_instance(1).get_node(3).node_id == 3
+    assert len(decoded) == 2
+
+    # Empty payloads remove the object without decoding.
+    mgr.receive_message("OpenZWave/1/node/2/", b"")
+    assert mgr.get_instance(1).get_node(2) is None
+    assert len(decoded) == 2
+
+
+def test_subscription_topics(mgr, options):
+    """Test topic filters are derived from the models."""
+    assert mgr.subscription_topics() == [
+        "OpenZWave/+/",
+        "OpenZWave/+/node/+/#",
+        "OpenZWave/+/status/#",
+        "OpenZWave/+/statistics/#",
+        "OpenZWave/+/event/#",
+    ]
+
+    options.instance_id = 1
+    assert mgr.subscription_topics(statistics=False) == [
+        "OpenZWave/1/",
+        "OpenZWave/1/node/+/",
+        "OpenZWave/1/node/+/instance/+/#",
+        "OpenZWave/1/node/+/association/+/#",
+        "OpenZWave/1/status/#",
+        "OpenZWave/1/event/#",
+    ]
+
+    # Deriving the topics does not touch the tree.
+    assert mgr.get_instance(1) is None
@@ -0,0 +1,61 @@
+"""Provide tests for the receive metrics."""
+from openzwavemqtt.const import EVENT_NODE_CHANGED
+from openzwavemqtt.metrics import Histogram, ReceiveMetrics
+
+
+def test_histogram():
+    """Test percentiles are reported as bucket bounds."""
+    histogram = Histogram((0.001, 0.01, 0.1))
+    for duration in [0.0005] * 90 + [0.005] * 9 + [0.5]:
+        histogram.observe(duration)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 0.001
+    assert histogram.percentile(90) == 0.001
+    assert histogram.percentile(99) == 0.01
+    assert histogram.percentile(100) == 0.5
+    assert histogram.summary()["max"] == 0.5
+    assert 'x_bucket{le="0.01"} 99' in histogram.prometheus("x")
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_receive_metrics(mgr, options):
+    """Test received messages are counted and timed."""
+    metrics = options.metrics = ReceiveMetrics()
+    calls = []
+    options.listen(EVENT_NODE_CHANGED, calls.append)
+
+    mgr.receive_message("OpenZWave/1/", "{}")
+    mgr.receive_message("OpenZWave/1/node/2/", '{"NodeID": 2}')
+    mgr.receive_message("OpenZWave/1/node/2/", '{"NodeID": 2, "Name": "a"}')
+    mgr.receive_payload("OpenZWave/1/node/3/", {"NodeID": 3})
+    options.instance_id = 1
+    mgr.receive_message("OpenZWave/2/", "{}")
+
+    assert len(calls) == 1
+    assert metrics.messages == {"+": 1, "+/node/+": 3}
+    assert metrics.bytes["+/node/+"] == 13 + 26
+    assert metrics.busiest_nodes() == [((1, 2), 2), ((1, 3), 1)]
+    assert metrics.filtered == 1
+    assert metrics.decode.count == 3
+    assert metrics.total.count == metrics.tree.count == metrics.listeners.count == 4
+    assert metrics.listeners.sum > 0
+
+    summary = metrics.summary()
+    assert set(summary["total"]) == {"count", "sum", "max", "p50", "p90", "p99"}
+
+    text = metrics.prometheus()
+    assert 'ozw_messages_total{topic_class="+/node/+"} 3' in text
+    assert 'ozw_node_messages_total{instance="1",node="2"} 2' in text
+    assert "ozw_filtered_messages_total 1" in text
+    assert "ozw_listeners_seconds_count 4" in text
+
+
+def test_receive_metrics_non_numeric_instance(mgr, options):
+    """Test node messages of a non-numeric instance are not counted per node."""
+    metrics = options.metrics = ReceiveMetrics()
+
+    mgr.receive_message("OpenZWave/foo/node/2/", '{"NodeID": 2}')
+
+    assert metrics.messages == {"foo/node/+": 1}
+    assert metrics.busiest_nodes() == []
@@ -0,0 +1,276 @@
+"""Provide tests for the options."""
+import asyncio
+import time
+
+from openzwavemqtt.const import (
+    EVENT_INSTANCE_EVENT,
+    EVENT_NODE_CHANGED,
+    EVENT_VALUE_ADDED,
+    EVENT_VALUE_CHANGED,
+    CommandClass,
+)
+
+VALUE_TOPIC = "OpenZWave/1/node/{}/instance/1/commandclass/{}/value/{}"
+
+
+def setup_values(mgr):
+    """Set up two nodes with values."""
+    mgr.mock_receive_json("OpenZWave/1", {})
+    for node_id in (2, 3):
+        mgr.mock_receive_json(f"OpenZWave/1/node/{node_id}", {})
+        mgr.mock_receive_json(f"OpenZWave/1/node/{node_id}/instance/1", {})
+        for cc_id in (37, 38):
+            mgr.mock_receive_json(
+                f"OpenZWave/1/node/{node_id}/instance/1/commandclass/{cc_id}", {}
+            )
+            mgr.mock_receive_json(VALUE_TOPIC.format(node_id, cc_id, cc_id), {})
+
+
+def test_scoped_listeners(mgr):
+    """Test listeners scoped to ids only receive matching events."""
+    setup_values(mgr)
+    options = mgr.options
+    calls = []
+
+    def listener(name):
+        """Return a listener that records calls."""
+        return lambda value: calls.append((name, value.node.id, value.id))
+
+    options.listen(EVENT_VALUE_CHANGED, listener("all"))
+    options.listen(EVENT_VALUE_CHANGED, listener("node"), node_id=2)
+    options.listen(
+        EVENT_VALUE_CHANGED,
+        listener("cc"),
+        command_class=CommandClass.SWITCH_MULTILEVEL,
+    )
+    options.listen(EVENT_VALUE_CHANGED, listener("value"), node_id=3, value_id_key=37)
+    options.listen(EVENT_VALUE_CHANGED, listener("instance"), instance_id=2)
+
+    for node_id in (2, 3):
+        for cc_id in (37, 38):
+            mgr.mock_receive_json(
+                VALUE_TOPIC.format(node_id, cc_id, cc_id), {"Value": 1}
+            )
+
+    assert calls == [
+        ("all", 2, 37),
+        ("node", 2, 37),
+        ("all", 2, 38),
+        ("node", 2, 38),
+        ("cc", 2, 38),
+        ("all", 3, 37),
+        ("value", 3, 37),
+        ("all", 3, 38),
+        ("cc", 3, 38),
+    ]
+
+
+def test_scoped_listener_ancestor_events(mgr):
+    """Test scoped listeners for events of objects higher up the tree."""
+    setup_values(mgr)
+    calls = []
+
+    mgr.options.listen(EVENT_NODE_CHANGED, calls.append, node_id=3)
+    # A node has no command class, so this listener never matches a node.
+    mgr.options.listen(EVENT_NODE_CHANGED, calls.append, command_class=37)
+    # Instance events have the scope of their instance.
+    mgr.options.listen(EVENT_INSTANCE_EVENT, calls.append, instance_id=1)
+    mgr.options.listen(EVENT_INSTANCE_EVENT, calls.append, instance_id=2)
+
+    mgr.mock_receive_json("OpenZWave/1/node/2", {"NodeID": 2})
+    mgr.mock_receive_json("OpenZWave/1/node/3", {"NodeID": 3})
+    mgr.mock_receive_json("OpenZWave/1/event/test", {"Node": 3})
+
+    assert calls == [
+        mgr.get_instance(1).get_node(3),
+        {"event": "test", "data": {"Node": 3}},
+    ]
+    assert calls[1].listener_scope.instance_id == 1
+
+
+def test_remove_scoped_listener(mgr):
+    """Test removing scoped listeners."""
+    setup_values(mgr)
+    calls = []
+
+    remove_first = mgr.options.listen(EVENT_VALUE_CHANGED, calls.append, node_id=2)
+    remove_second = mgr.options.listen(EVENT_VALUE_CHANGED, calls.append, node_id=2)
+
+    remove_first()
+    mgr.mock_receive_json(VALUE_TOPIC.format(2, 37, 37), {"Value": 1})
+    assert len(calls) == 1
+
+    remove_second()
+    assert EVENT_VALUE_CHANGED not in mgr.options.scoped_listeners
+    mgr.mock_receive_json(VALUE_TOPIC.format(2, 37, 37), {"Value": 2})
+    assert len(calls) == 1
+
+
+def test_has_listeners_after_removal(options):
+    """Test events have no listeners once all listeners are removed."""
+    removers = [
+        options.listen(EVENT_VALUE_CHANGED, print),
+        options.listen(EVENT_VALUE_CHANGED, print, node_id=2),
+        options.listen(EVENT_VALUE_CHANGED, print, node_id=3),
+        options.listen(EVENT_VALUE_CHANGED, print, instance_id=1, node_id=2),
+        options.listen_batch(EVENT_VALUE_CHANGED, print),
+    ]
+
+    for remove in removers:
+        assert options.has_listeners(EVENT_VALUE_CHANGED)
+        remove()
+
+    assert not options.has_listeners(EVENT_VALUE_CHANGED)
+    assert not options.listeners
+    assert not options.scoped_listeners
+    assert not options.batch_listeners
+
+
+def test_batch_listeners(mgr):
+    """Test batch listeners receive coalesced lists of events."""
+    batches = []
+    mgr.options.listen_batch(EVENT_VALUE_ADDED, lambda batch: batches.append(batch))
+    mgr.options.listen_batch(EVENT_VALUE_CHANGED, lambda batch: batches.append(batch))
+
+    async def receive():
+        """Receive messages inside the loop."""
+        setup_values(mgr)
+
+        # Events are held until flushed or the end of the loop tick.
+        assert not batches
+        for _ in range(3):
+            mgr.mock_receive_json(VALUE_TOPIC.format(2, 37, 37), {"Value": 1})
+        mgr.mock_receive_json(VALUE_TOPIC.format(3, 37, 37), {"Value": 2})
+        mgr.options.flush_batches()
+
+    asyncio.run(receive())
+
+    added, changed = batches
+    assert [(value.node.id, value.id) for value in added] == [
+        (2, 37),
+        (2, 38),
+        (3, 37),
+        (3, 38),
+    ]
+    assert [(value.node.id, value.value) for value in changed] == [(2, 1), (3, 2)]
+
+    mgr.options.flush_batches()
+    assert len(batches) == 2
+
+
+def test_batch_without_loop(mgr):
+    """Test batches are delivered by batch size without a running loop."""
+    batches = []
+    mgr.options.batch_size = 3
+    mgr.options.listen_batch(EVENT_VALUE_ADDED, batches.append)
+    mgr.options.listen_batch(EVENT_VALUE_CHANGED, batches.append)
+    setup_values(mgr)
+
+    assert [len(batch) for batch in batches] == [3]
+    for _ in range(2):
+        mgr.mock_receive_json(VALUE_TOPIC.format(2, 37, 37), {"Value": 1})
+        mgr.mock_receive_json(VALUE_TOPIC.format(2, 37, 37), {"Value": 2})
+    # The changed events of a value are coalesced.
+    assert len(mgr.options.pending_batch) == 2
+
+    mgr.options.flush_batches()
+    assert [len(batch) for batch in batches] == [3, 1, 1]
+    assert batches[-1][0].value == 2
+
+
+def test_batch_per_message(mgr):
+    """Test batches are delivered after each message if enabled."""
+    batches = []
+    mgr.options.flush_batches_per_message = True
+    mgr.options.listen_batch(EVENT_VALUE_ADDED, batches.append)
+    setup_values(mgr)
+
+    assert [len(batch) for batch in batches] == [1, 1, 1, 1]
+    assert not mgr.options.pending_batch
+
+
+def test_batch_changed_keys(mgr):
+    """Test batched changed events hold the keys of all coalesced messages."""
+    keys = []
+    mgr.options.listen_batch(
+        EVENT_VALUE_CHANGED, lambda batch: keys.extend(v.changed_keys for v in batch)
+    )
+
+    async def receive():
+        """Receive messages inside the loop."""
+        setup_values(mgr)
+        topic = VALUE_TOPIC.format(2, 37, 37)
+        mgr.mock_receive_json(topic, {"Value": 1})
+        mgr.mock_receive_json(topic, {"Value": 1, "Label": "Switch"})
+        await asyncio.sleep(0)
+        assert keys == [{"Value", "Label"}]
+
+        mgr.mock_receive_json(topic, {"Value": 2, "Label": "Switch"})
+        await asyncio.sleep(0)
+        assert keys[-1] == {"Value"}
+
+    asyncio.run(receive())
+    command_class = mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(37)
+    assert not command_class.get_value(37).changed_keys
+
+
+def test_batch_size(mgr):
+    """Test batches are delivered once the batch size is reached."""
+    batches = []
+    mgr.options.batch_size = 3
+    mgr.options.listen_batch(EVENT_VALUE_ADDED, batches.append)
+
+    async def receive():
+        """Receive messages inside the loop."""
+        setup_values(mgr)
+        assert [len(batch) for batch in batches] == [3]
+        mgr.options.flush_batches()
+
+    asyncio.run(receive())
+    assert [len(batch) for batch in batches] == [3, 1]
+
+
+def test_batch_loop_tick(mgr):
+    """Test batches are delivered at the end of the loop tick."""
+    batches = []
+    mgr.options.listen_batch(EVENT_VALUE_ADDED, batches.append)
+
+    async def receive():
+        """Receive messages inside the loop."""
+        setup_values(mgr)
+        assert not batches
+        await asyncio.sleep(0)
+        assert [len(batch) for batch in batches] == [4]
+
+    asyncio.run(receive())
+
+
+def test_profile_listeners(mgr, options, caplog):
+    """Test listener calls are profiled per event and listener."""
+    options.profile_listeners = True
+    options.slow_listener_threshold = 0.01
+    added = []
+
+    def slow_listener(value):
+        """Take longer than the threshold."""
+        time.sleep(0.02)
+
+    options.listen(EVENT_VALUE_ADDED, added.append)
+    options.listen(EVENT_VALUE_CHANGED, slow_listener)
+    setup_values(mgr)
+    mgr.mock_receive_json(VALUE_TOPIC.format(2, 37, 37), {"Value": 1})
+
+    added_profile = options.listener_profiles[(EVENT_VALUE_ADDED, added.append)]
+    assert added_profile.calls == len(added) == 4
+    assert added_profile.slow_calls == 0
+
+    slow_profile = options.listener_profiles[(EVENT_VALUE_CHANGED, slow_listener)]
+    assert slow_profile.calls == slow_profile.slow_calls == 1
+    assert slow_profile.max >= 0.02
+    assert "test_profile_listeners.<locals>.slow_listener for value_changed" in (
+        caplog.text
+    )
+
+    lines = options.dump_listener_profiles().splitlines()
+    assert len(lines) == 3
+    assert lines[1].startswith(EVENT_VALUE_CHANGED)
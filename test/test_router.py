@@ -0,0 +1,112 @@
+"""Provide tests for the topic router."""
+from openzwavemqtt.const import (
+    EVENT_NODE_STATISTICS_CHANGED,
+    EVENT_VALUE_ADDED,
+    EVENT_VALUE_CHANGED,
+)
+
+VALUE_TOPIC = "OpenZWave/1/node/2/instance/1/commandclass/37/value/{}/"
+
+
+def setup_node(mgr):
+    """Set up a node with a command class."""
+    mgr.mock_receive_json("OpenZWave/1/", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/", {"NodeID": 2})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/", {"Instance": 1})
+    mgr.mock_receive_json(
+        "OpenZWave/1/node/2/instance/1/commandclass/37/", {"CommandClassId": 37}
+    )
+
+
+def test_route_values(mgr):
+    """Test values are routed once the collection is known."""
+    events = []
+    mgr.options.listen(EVENT_VALUE_ADDED, lambda value: events.append(("add", value)))
+    mgr.options.listen(
+        EVENT_VALUE_CHANGED, lambda value: events.append(("change", value))
+    )
+    setup_node(mgr)
+
+    mgr.mock_receive_json(VALUE_TOPIC.format(3), {"Value": 1})
+    assert "1/node/2/instance/1/commandclass/37/value" in mgr.router.collections
+
+    # Tree walking is no longer needed for this collection.
+    mgr.process_message = None
+    mgr.mock_receive_json(VALUE_TOPIC.format(3), {"Value": 2})
+    mgr.mock_receive_json(VALUE_TOPIC.format(4), {"Value": 3})
+
+    command_class = mgr.get_instance(1).get_node(2).get_instance(1).get_commandclass(37)
+    assert command_class.get_value(3).value == 2
+    assert command_class.get_value(4).value == 3
+    assert [(kind, value.id) for kind, value in events] == [
+        ("add", 3),
+        ("change", 3),
+        ("add", 4),
+    ]
+
+
+def test_route_child(mgr):
+    """Test single children of an item are routed."""
+    events = []
+    mgr.options.listen(EVENT_NODE_STATISTICS_CHANGED, events.append)
+    setup_node(mgr)
+
+    mgr.mock_receive_json("OpenZWave/1/node/2/statistics/", {"sendCount": 1})
+    assert "1/node/2/statistics" in mgr.router.children
+
+    mgr.process_message = None
+    mgr.mock_receive_json("OpenZWave/1/node/2/statistics/", {"sendCount": 2})
+
+    assert mgr.get_instance(1).get_node(2).get_statistics().send_count == 2
+    assert len(events) == 1
+
+
+def test_remove_clears_routes(mgr):
+    """Test removing items forgets routes into the removed part of the tree."""
+    setup_node(mgr)
+    mgr.mock_receive_json(VALUE_TOPIC.format(3), {"Value": 1})
+    mgr.mock_receive_json("OpenZWave/1/node/2/statistics/", {"sendCount": 1})
+
+    mgr.receive_message("OpenZWave/1/node/2/", "")
+    assert sorted(mgr.router.collections) == ["", "1/node"]
+    assert not mgr.router.children
+    assert mgr.get_instance(1).get_node(2) is None
+
+    # Messages for the removed node are held again until it is added back.
+    mgr.mock_receive_json(VALUE_TOPIC.format(3), {"Value": 1})
+    assert mgr.get_instance(1).get_node(2).get_instance(1) is None
+    assert "1/node/2/instance/1/commandclass/37/value" not in mgr.router.collections
+
+    setup_node(mgr)
+    mgr.mock_receive_json(VALUE_TOPIC.format(3), {"Value": 5})
+    node = mgr.get_instance(1).get_node(2)
+    assert node.get_instance(1).get_commandclass(37).get_value(3).value == 5
+
+
+def test_held_messages_not_routed(mgr):
+    """Test no routes are learned below models that hold messages."""
+    mgr.mock_receive_json("OpenZWave/1/", {})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1/", {"Instance": 1})
+
+    assert "1/node/2/instance" not in mgr.router.collections
+
+    mgr.mock_receive_json("OpenZWave/1/node/2/", {"NodeID": 2})
+    assert mgr.get_instance(1).get_node(2).get_instance(1).instance == 1
+
+
+def test_remove_keeps_other_routes(mgr):
+    """Test removing an item only forgets the routes below it."""
+    setup_node(mgr)
+    mgr.mock_receive_json("OpenZWave/1/node/3/", {"NodeID": 3})
+    mgr.mock_receive_json(VALUE_TOPIC.format(3), {"Value": 1})
+    mgr.mock_receive_json("OpenZWave/1/node/2/statistics/", {"sendCount": 1})
+    mgr.mock_receive_json("OpenZWave/1/node/3/statistics/", {"sendCount": 1})
+
+    # Removing a value keeps the route of its collection.
+    mgr.receive_message(VALUE_TOPIC.format(3), "")
+    assert "1/node/2/instance/1/commandclass/37/value" in mgr.router.collections
+
+    mgr.receive_message("OpenZWave/1/node/2/", "")
+    assert not any(prefix.startswith("1/node/2/") for prefix in mgr.router.collections)
+    assert list(mgr.router.children) == ["1/node/3/statistics"]
+    assert "1/node" in mgr.router.collections
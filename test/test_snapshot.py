@@ -0,0 +1,178 @@
+"""Provide tests for snapshots of the manager."""
+import pytest
+
+from openzwavemqtt.const import EVENT_VALUE_CHANGED, CommandClass
+from openzwavemqtt.snapshot import (
+    load_snapshot,
+    prune_unconfirmed,
+    save_snapshot,
+    snapshot_model,
+)
+
+from .conftest import MockManager, MockOptions
+
+CC_TOPIC = "OpenZWave/1/node/2/instance/1/commandclass/37"
+
+
+def setup_manager(mgr):
+    """Set up a manager with a node."""
+    mgr.mock_receive_json("OpenZWave/1", {"Status": "driverAllNodesQueried"})
+    mgr.mock_receive_json("OpenZWave/1/status", {"Status": "driverReady"})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {"NodeID": 2})
+    mgr.mock_receive_json("OpenZWave/1/node/2/statistics", {"sendCount": 3})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {"Instance": 1})
+    mgr.mock_receive_json(CC_TOPIC, {"CommandClassId": 37})
+    mgr.mock_receive_json(
+        f"{CC_TOPIC}/value/1234", {"Index": 0, "Value": True, "ValueIDKey": 1234}
+    )
+    # Held until the node is received.
+    mgr.mock_receive_json("OpenZWave/1/node/3/instance/1", {"Instance": 1})
+
+
+def test_snapshot(mgr, tmp_path):
+    """Test saving and loading a snapshot."""
+    setup_manager(mgr)
+    file_path = tmp_path / "snapshot.json.gz"
+    save_snapshot(mgr, file_path)
+
+    events = []
+    options = MockOptions()
+    options.notify = lambda event, data: events.append(event)
+    restored = MockManager(options)
+    load_snapshot(restored, file_path)
+
+    assert not events
+    assert snapshot_model(restored) == snapshot_model(mgr)
+
+    node = restored.get_instance(1).get_node(2)
+    value = restored.get_instance(1).get_value_by_id_key(1234)
+    assert value.topic == f"{CC_TOPIC}/value/1234"
+    assert node.get_value(CommandClass.SWITCH_BINARY, 0) is value
+    assert node.get_statistics().send_count == 3
+    assert restored.get_instance(1).get_status().status == "driverReady"
+
+    # Live messages only fire events for changes.
+    options.notify = lambda event, data: events.append((event, data))
+    restored.mock_receive_json(
+        f"{CC_TOPIC}/value/1234", {"Index": 0, "Value": True, "ValueIDKey": 1234}
+    )
+    restored.mock_receive_json(
+        f"{CC_TOPIC}/value/1234", {"Index": 0, "Value": False, "ValueIDKey": 1234}
+    )
+    assert events == [(EVENT_VALUE_CHANGED, value)]
+
+    # The held messages are processed once the node is received.
+    restored.mock_receive_json("OpenZWave/1/node/3", {"NodeID": 3})
+    assert restored.get_instance(1).get_node(3).get_instance(1).instance == 1
+
+
+def test_snapshot_pending_removal(mgr, tmp_path):
+    """Test held removals are restored as removals."""
+    setup_manager(mgr)
+    node_topic = "OpenZWave/1/node/4"
+    mgr.mock_receive_json(f"{node_topic}/instance/1", {"Instance": 1})
+    mgr.mock_receive_json(f"{node_topic}/instance/2", {"Instance": 2})
+    mgr.receive_message(f"{node_topic}/instance/2", "")
+    file_path = tmp_path / "snapshot.json.gz"
+    save_snapshot(mgr, file_path)
+
+    restored = MockManager(MockOptions())
+    load_snapshot(restored, file_path)
+    assert snapshot_model(restored) == snapshot_model(mgr)
+
+    restored.mock_receive_json(node_topic, {"NodeID": 4})
+    node = restored.get_instance(1).get_node(4)
+    assert [instance.id for instance in node.instances()] == [1]
+
+
+def test_load_into_used_manager(mgr, tmp_path):
+    """Test snapshots are only loaded into empty managers."""
+    setup_manager(mgr)
+    file_path = tmp_path / "snapshot.json.gz"
+    save_snapshot(mgr, file_path)
+
+    with pytest.raises(ValueError):
+        load_snapshot(mgr, file_path)
+
+
+def test_snapshot_lazy_values(tmp_path):
+    """Test held values are saved and restored without building them."""
+    options = MockOptions()
+    options.lazy_values = True
+    mgr = MockManager(options)
+    setup_manager(mgr)
+    file_path = tmp_path / "snapshot.json.gz"
+    state = snapshot_model(mgr)
+    save_snapshot(mgr, file_path)
+
+    options = MockOptions()
+    options.lazy_values = True
+    restored = MockManager(options)
+    load_snapshot(restored, file_path)
+
+    assert snapshot_model(restored) == state
+    ozw_instance = restored.get_instance(1)
+    assert list(ozw_instance.lazy_values) == [1234]
+    assert ozw_instance.get_value_by_id_key(1234).value is True
+
+
+@pytest.mark.parametrize("lazy_values", [False, True])
+def test_prune_unconfirmed(mgr, tmp_path, lazy_values):
+    """Test restored objects without messages after loading are pruned."""
+    mgr.options.lazy_values = lazy_values
+    setup_manager(mgr)
+    mgr.mock_receive_json(f"{CC_TOPIC}/value/1235", {"Index": 1, "ValueIDKey": 1235})
+    mgr.mock_receive_json("OpenZWave/1/node/5", {"NodeID": 5})
+    mgr.mock_receive_json("OpenZWave/1/node/5/instance/1", {"Instance": 1})
+    file_path = tmp_path / "snapshot.json.gz"
+    save_snapshot(mgr, file_path)
+
+    events = []
+    options = MockOptions()
+    options.lazy_values = lazy_values
+    restored = MockManager(options)
+    load_snapshot(restored, file_path)
+    assert "1/node/2/instance/1/commandclass/37/value/1235" in (
+        restored.unconfirmed_topics
+    )
+
+    # Replay the retained messages of everything but value 1235 and node 5.
+    setup_manager(restored)
+    options.notify = lambda event, data: events.append((event, data.id))
+
+    assert prune_unconfirmed(restored) == [
+        "1/node/2/instance/1/commandclass/37/value/1235",
+        "1/node/5",
+    ]
+    assert restored.unconfirmed_topics is None
+    ozw_instance = restored.get_instance(1)
+    assert ozw_instance.get_node(5) is None
+    # Node 3 only holds messages and is kept.
+    assert ozw_instance.get_node(3) is not None
+    assert ozw_instance.get_value_by_id_key(1235) is None
+    assert ozw_instance.get_value_by_id_key(1234).value is True
+    assert ("node_removed", 5) in events
+    assert ("instance_removed", 1) not in events
+
+
+def test_prune_confirmed_by_descendants(mgr, tmp_path):
+    """Test objects with messages for their descendants are not pruned."""
+    mgr.mock_receive_json("OpenZWave/1/status", {"Status": "driverReady"})
+    mgr.mock_receive_json("OpenZWave/1/node/2", {"NodeID": 2})
+    mgr.mock_receive_json("OpenZWave/1/node/2/instance/1", {"Instance": 1})
+    file_path = tmp_path / "snapshot.json.gz"
+    save_snapshot(mgr, file_path)
+
+    restored = MockManager(MockOptions())
+    load_snapshot(restored, file_path)
+    # The OZW instance has no message of its own.
+    assert "1" not in restored.unconfirmed_topics
+
+    # Node 2 is only confirmed through its instance.
+    restored.mock_receive_json("OpenZWave/1/status", {"Status": "driverReady"})
+    restored.mock_receive_json("OpenZWave/1/node/2/instance/1", {"Instance": 1})
+
+    assert prune_unconfirmed(restored) == []
+    ozw_instance = restored.get_instance(1)
+    assert ozw_instance is not None
+    assert ozw_instance.get_node(2).get_instance(1) is not None
@@ -0,0 +1,112 @@
+"""Tests for mqtt_client util submodule."""
+import asyncio
+import json
+
+import pytest
+
+from openzwavemqtt.exceptions import PublishQueueFullError
+from openzwavemqtt.util.mqtt_client import MQTTClient
+
+
+class FakeMQTTClient(MQTTClient):
+    """MQTT client that records published messages instead of connecting."""
+
+    def __init__(self, **kwargs):
+        """Set up the client."""
+        self.published_messages = []
+        self.release = asyncio.Event()
+        self.block = False
+        super().__init__("localhost", **kwargs)
+
+    def create_client(self):
+        """Do not create an asyncio client."""
+
+    async def publish(self, topic, payload=None, **kwargs):
+        """Record a message, blocking until released if block is set."""
+        if self.block:
+            await self.release.wait()
+        self.published_messages.append((topic, json.loads(payload)))
+
+
+def test_publish():
+    """Test queued messages are published with metrics."""
+
+    async def run():
+        client = FakeMQTTClient(publish_concurrency=2)
+        task = asyncio.create_task(client._handle_publish())
+        for index in range(5):
+            client.send_message(f"OpenZWave/1/command/{index}", {"index": index})
+        assert client.publish_queue_depth == 5
+
+        await client.publish_queue.join()
+        task.cancel()
+        return client
+
+    client = asyncio.run(run())
+    assert sorted(client.published_messages) == [
+        (f"OpenZWave/1/command/{index}", {"index": index}) for index in range(5)
+    ]
+    assert client.published == 5
+    assert client.max_publish_queue_depth == 5
+    assert client.publish_in_flight == 0
+    assert client.publish_rejected == 0
+    assert client.average_publish_latency >= 0
+
+
+def test_publish_queue_full():
+    """Test a full queue rejects messages or makes senders wait."""
+
+    async def run():
+        client = FakeMQTTClient(publish_concurrency=1, publish_queue_size=2)
+        client.block = True
+        task = asyncio.create_task(client._handle_publish())
+
+        # One message is in flight and two are queued.
+        client.send_message("OpenZWave/1/command/0", {})
+        while not client.publish_in_flight:
+            await asyncio.sleep(0)
+        client.send_message("OpenZWave/1/command/1", {})
+        client.send_message("OpenZWave/1/command/2", {})
+
+        with pytest.raises(PublishQueueFullError):
+            client.send_message("OpenZWave/1/command/3", {})
+        assert client.publish_rejected == 1
+
+        queued = asyncio.create_task(client.queue_message("OpenZWave/1/command/4", {}))
+        await asyncio.sleep(0)
+        assert not queued.done()
+
+        client.release.set()
+        await queued
+        await client.publish_queue.join()
+        task.cancel()
+        return client
+
+    client = asyncio.run(run())
+    assert [topic for topic, _ in client.published_messages] == [
+        f"OpenZWave/1/command/{index}" for index in (0, 1, 2, 4)
+    ]
+    assert client.max_publish_queue_depth == 2
+
+
+def test_publish_invalid_payload():
+    """Test a payload that can't be serialized is rejected by the sender."""
+
+    async def run():
+        client = FakeMQTTClient()
+        task = asyncio.create_task(client._handle_publish())
+
+        with pytest.raises(TypeError):
+            client.send_message("OpenZWave/1/command/0", {"value": object()})
+        with pytest.raises(TypeError):
+            await client.queue_message("OpenZWave/1/command/1", {"value": object()})
+        assert client.publish_queue_depth == 0
+
+        client.send_message("OpenZWave/1/command/2", {})
+        await client.publish_queue.join()
+        assert not task.done()
+        task.cancel()
+        return client
+
+    client = asyncio.run(run())
+    assert client.published_messages == [("OpenZWave/1/command/2", {})]